@@ -0,0 +1,57 @@
+"""Measures the memory and time taken to build `File` objects from a folder listing.
+
+Usage: python benchmarks/file_listing.py [number of entries (Default: 100000)]
+"""
+
+from datetime import datetime, timedelta
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blomp_api.fso import File
+from blomp_api.utils.path import Path
+
+
+def listing(n: int):
+    start = datetime(2024, 1, 1)
+
+    return [{
+        "hash": f"{i:032x}",
+        "last_modified": (start+timedelta(seconds=i)).isoformat(),
+        "bytes": i,
+        "name": f"folder/subfolder/file_{i}.txt",
+        "content_type": "text/plain"
+    } for i in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = listing(n)
+    path = Path("folder/subfolder")
+
+    tracemalloc.start()
+    t = time.perf_counter()
+    files = [File(path, fd, None) for fd in data]  # type: ignore
+    elapsed = time.perf_counter()-t
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t = time.perf_counter()
+    for file in files:
+        file.file_path
+        file.last_modified
+    access = time.perf_counter()-t
+
+    scale = 100000/n
+    print(f"{n} entries")
+    print(f"Construction: {elapsed*scale:.3f} s per 100k entries")
+    print(f"Memory: {memory*scale/2**20:.1f} MiB per 100k entries")
+    print(f"First access of file_path and last_modified: {access*scale:.3f} s per 100k entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,9 @@
 from .blomp import Blomp
+from .exceptions import ChunkRejectedError, CircuitOpenError, IntegrityError, TransferCancelledError
+from .utils.transfer_manager import TransferFuture, TransferManager
+from .utils.hedging import HedgingPolicy
+from .utils.listing_cache import ListingCache
+from .utils.monitor import AggregateMonitor
+from .utils.prefetcher import Prefetcher
+from .utils.rate_limiter import BandwidthLimiter
+from .utils.retry_policy import RetryPolicy
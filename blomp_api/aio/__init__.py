@@ -0,0 +1,6 @@
+# Asyncio client (requires the "aiohttp" package)
+
+from .blomp import AsyncBlomp
+from .file import AsyncFile
+from .folder import AsyncFolder
+from .session import AsyncSession
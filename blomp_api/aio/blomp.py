@@ -0,0 +1,112 @@
+from ..utils.scraping import parse_account_info, parse_login_page
+from .folder import AsyncFolder
+from .session import AsyncSession
+
+from typing import Dict, Optional
+
+
+class AsyncBlomp:
+    """
+    Class to sign in the Blomp account and access its files and folders with the asyncio client.
+    The `login` method must be awaited before using this object, or this object must be used as an asynchronous context manager.
+
+    Parameters
+    ----------
+    email : `str`
+        Blomp account e-mail
+    password : `str`
+        Blomp account password
+    max_concurrency : `int`, optional
+        Maximum number of requests in progress at the same time. (Default: 100)
+
+    Examples
+    --------
+    >>> async with AsyncBlomp("youremail@example.com", "yourpassword") as blomp:
+    ...     root = await blomp.get_root_directory()
+    """
+
+    def __init__(self, email: str, password: str, max_concurrency: int = 100):
+        self.__email = email
+        self.__password = password
+        self.__ss = AsyncSession(max_concurrency)
+        self.__info: Dict[str, str] = {}
+
+    async def __aenter__(self) -> "AsyncBlomp":
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def available_storage(self) -> Optional[str]:
+        """Available storage in Blomp account, or None if this information cannot be obtained."""
+
+        return self.__info.get("avaliable_storage")
+
+    @property
+    def files_and_folders(self) -> Optional[int]:
+        """Number of stored files and folders, or None if this information cannot be obtained."""
+
+        ff = self.__info.get("files_and_folders")
+
+        return None if ff is None else int(ff)
+
+    @property
+    def shared_files(self) -> Optional[int]:
+        """Number of shared files, or None if this information cannot be obtained."""
+
+        ff = self.__info.get("shared_files")
+
+        return None if ff is None else int(ff)
+
+    @property
+    def storage_capacity(self) -> Optional[str]:
+        """Total storage in the Blomp account, or None if this information cannot be obtained."""
+
+        ff = self.__info.get("storage_capacity")
+
+        return None if ff is None else ff.strip()
+
+    @property
+    def used_storage(self) -> Optional[str]:
+        """Used storage in the Blomp account, or None if this information cannot be obtained."""
+
+        return self.__info.get("used_storage")
+
+    async def close(self):
+        """Closes the connections of this client"""
+
+        await self.__ss.close()
+
+    async def get_root_directory(self) -> AsyncFolder:
+        """Returns an AsyncFolder object from the root directory, with its contents loaded"""
+
+        root = AsyncFolder("", None, self.__ss)
+        await root.reload()
+
+        return root
+
+    async def login(self):
+        """Signs in the Blomp account.
+
+        Raises
+        ------
+        ConnectionError
+            Raised if e-mail and/or password entered is incorrect, or if connection to server fails.
+        """
+
+        async with self.__ss.request("POST", "https://dashboard.blomp.com/authorize",
+                                     data={"email": self.__email, "password": self.__password}) as p:
+            if str(p.url) == "https://dashboard.blomp.com":
+                raise ConnectionError("Incorrect email or password")
+
+            if p.status >= 400:
+                raise ConnectionError(f"Login returned status code {p.status}")
+
+            content = await p.text()
+
+        self.__ss.token, self.__ss.client_id = parse_login_page(content)
+
+        index_page = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/index")
+        self.__info = parse_account_info(index_page)
@@ -0,0 +1,254 @@
+from ..response_types import FileData, ShareLinkResponse
+from ..utils.monitor import DownloadMonitor, Monitor
+from ..utils.path import Path
+from ..utils.share import email_field
+from .progress import ProgressCallback, notify
+from .session import AsyncSession
+
+from datetime import datetime
+from typing import BinaryIO, Iterable, Optional, Tuple, Union
+
+import asyncio
+import os
+import pathlib
+
+
+class AsyncFile:
+    """Class to manipulate a file stored in the Blomp Cloud, with the asyncio client"""
+
+    def __init__(self, path: Union[Path, str], dataobj: FileData, session: AsyncSession):
+        if isinstance(path, str):
+            path = Path(path)
+
+        self.__hash: str = dataobj["hash"]
+        self.__last_modified: datetime = datetime.fromisoformat(dataobj["last_modified"])
+        self.__length: int = dataobj["bytes"]
+        self.__name: str = Path(dataobj["name"]).parts[-1]
+        self.__content_type: str = dataobj["content_type"]
+
+        self.__ss = session
+        self.__path = path
+        self.__file_id: Optional[int] = None
+        self.__share_status: Optional[bool] = None
+        self.__link: Optional[str] = None
+        self.__file_path: str = str(self.__path/Path(self.__name))
+
+    def __hash__(self) -> int:
+        return int(self.__hash, 16)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __repr__(self) -> str:
+        return f"AsyncFile({self.__path}/{self.__name})"
+
+    def __str__(self) -> str:
+        return self.__name
+
+    async def __downloader(self, _file: BinaryIO, _buffer_size: int, _close: bool, _monitor: Monitor,
+                           _callback: Optional[ProgressCallback]):
+        loop = asyncio.get_running_loop()
+
+        try:
+            async with self.__ss.request("GET", "https://dashboard.blomp.com/dashboard/storage/download_object",
+                                         params=dict(path=self.__file_path, filename=self.__name, size=self.__length)) as r:
+                async for chunk in r.content.iter_chunked(_buffer_size):
+                    _monitor._update(await loop.run_in_executor(None, _file.write, chunk))
+                    await notify(_callback, _monitor)
+
+            await loop.run_in_executor(None, _file.flush)
+        finally:
+            if _close:
+                _file.close()
+
+    def _parent_path_changed(self, new_path: Path):
+        self.__path = new_path
+        self.__file_path: str = str(self.__path/Path(self.__name))
+
+    async def __share_info(self):
+        info: ShareLinkResponse = (await self.__ss.json("GET", "https://dashboard.blomp.com/dashboard/file/share/link",
+                                                        params=dict(path=self.__file_path, size=self.__length)))["info"]
+        info["link"] = f"https://sharedby.blomp.com/{info['link']}"
+        self.__file_id = info["id"]
+        self.__share_status = bool(info["status"])
+        self.__link = info["link"]
+
+    @property
+    def content_type(self) -> str:
+        """Mime type of file"""
+
+        return self.__content_type
+
+    @property
+    def file_path(self) -> str:
+        """Full file path"""
+
+        return self.__file_path
+
+    @property
+    def last_modified(self) -> datetime:
+        """Date and time the file was last modified"""
+
+        return self.__last_modified
+
+    @property
+    def md5_hash(self) -> str:
+        """File MD5 hash"""
+
+        return self.__hash
+
+    @property
+    def name(self) -> str:
+        """File name"""
+
+        return self.__name
+
+    @property
+    def size(self) -> int:
+        """File size"""
+
+        return self.__length
+
+    def download(self, file_or_path: Union[str, pathlib.Path, BinaryIO] = "", buffer_size: int = 8192,
+                 callback: Optional[ProgressCallback] = None) -> Tuple["asyncio.Task[None]", Monitor]:
+        """Downloads the file to a specified directory or file-like object. Must be called from a running event loop.
+
+        Parameters
+        ----------
+        file_or_path : `str` or `pathlib.Path` or file-like object
+            If this parameter is a string or a Path, then it can be a directory or file path.
+            If the parameter value exists as a directory, then the file will be saved in this directory with the same name as this file.
+            Otherwise (path + file name or just the file name), the parameter will be opened as a file, with its contents being saved there.
+
+            If this parameter is a file-like object, the content will be saved in it.
+        buffer_size : int, optional
+            Size, in bytes, of the content downloaded in each iteration. (Default: 8192)
+        callback : callable, optional
+            Function or coroutine function called with the download monitor after each iteration. (Default: None)
+
+        Returns
+        -------
+        download_task : `asyncio.Task`
+            A task responsible for downloading the file, which can be awaited.
+        download_monitor : DownloadMonitor
+            An object that can be used to monitor download progress.
+        """
+
+        fp = file_or_path
+        close = False
+
+        if isinstance(fp, (str, pathlib.Path)):
+            if isinstance(fp, str):
+                fp = pathlib.Path(fp)
+
+            if os.path.isdir(fp):
+                fp /= pathlib.Path(self.__name)
+
+            fp = open(fp, 'wb')
+            close = True
+
+        monitor = DownloadMonitor(self.__length)
+        task = asyncio.ensure_future(self.__downloader(fp, buffer_size, close, monitor, callback))
+
+        monitor._start()
+        task.add_done_callback(monitor._finish_task)
+
+        return task, monitor
+
+    async def rename(self, new_name: str) -> bool:
+        """Rename this file
+
+        Parameters
+        ----------
+        new_name : `str`
+            New name for this file
+
+        Returns
+        -------
+        success : `bool`
+            True, if the server reports that the operation was successful, or False otherwise.
+        """
+
+        path_ = self.__path.as_dir(end_sep=bool(self.__path))
+        r = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/file/rename",
+                                 params=dict(original_name=self.__name, type="file", name=new_name, path=path_))
+
+        success = r == "success"
+        if success:
+            self.__name = new_name
+            self.__file_path = str(self.__path/Path(self.__name))
+            await self.__share_info()
+
+        return success
+
+    async def share(self, emails: Optional[Iterable[str]] = None, anyone_can_view: bool = False) -> str:
+        """Enables the sharing feature for this file.
+
+        Parameters
+        ----------
+        emails : `Iterable[str]`, optional
+            Emails that will receive the shared file link. (Default: None (The link will not be sent to any email))
+        anyone_can_view : `bool`, optional
+            If True, anyone on the internet can see this file. If False, only added registered users (see email parameter) can see the file (theoretically).
+
+        Returns
+        -------
+        link : `str`
+            Shared file link
+        """
+
+        perm = int(bool(anyone_can_view))
+
+        email = email_field(emails)
+
+        if self.__file_id is None:
+            await self.__share_info()
+
+        async with self.__ss.request("POST", "https://dashboard.blomp.com/dashboard/file/share/send",
+                                     data=dict(_token=self.__ss.token, email=email, link=self.__link, permission=perm),
+                                     allow_redirects=False):
+            pass
+
+        return self.__link  # type: ignore
+
+    async def share_switch_off(self) -> bool:
+        """Disables sharing of this file.
+
+        Returns
+        -------
+        success : `bool`
+            True, if the server reports that the operation was successful, or False otherwise.
+        """
+
+        if self.__file_id is None:
+            await self.__share_info()
+
+        if not self.__share_status:
+            raise Exception("This file is not being shared")
+
+        r = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/file/share/switch",
+                                 params=dict(status=0, id=self.__file_id))
+        self.__share_status = False
+
+        return r == "success"
+
+    async def share_switch_on(self) -> bool:
+        """Enables sharing of this file.
+
+        Returns
+        -------
+        success : `bool`
+            True, if the server reports that the operation was successful, or False otherwise.
+        """
+
+        if self.__file_id is None:
+            await self.__share_info()
+
+        if self.__share_status:
+            raise Exception("This file is already being shared")
+
+        r = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/file/share/switch",
+                                 params=dict(status=1, id=self.__file_id))
+        self.__share_status = True
+
+        return r == "success"
@@ -0,0 +1,490 @@
+from ..exceptions import ChunkRejectedError
+from ..response_types import FileData, Subdir
+from ..utils.dropzone import dropzone_encoder, get_file_size
+from ..utils.monitor import Monitor, UploadMonitor
+from ..utils.path import Path
+from ..utils.ranges import split_range
+from .file import AsyncFile
+from .progress import ProgressCallback, notify
+from .session import AsyncSession
+
+from requests_toolbelt import MultipartEncoder
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple, Union
+from uuid import uuid4
+
+import asyncio
+import io
+import pathlib
+
+
+class AsyncFolder:
+    """Class to manipulate a folder stored in the Blomp Cloud, with the asyncio client.
+
+    Unlike `Folder`, the folder contents are not loaded on initialization. The `reload` method must be awaited before accessing them.
+    Subfolders are also returned without their contents loaded.
+    """
+
+    def __init__(self, path: Union[str, Path], parent: Optional["AsyncFolder"], session: AsyncSession):
+        if isinstance(path, str):
+            path = Path(path)
+
+        self.__ss = session
+        self.__subdirectories: List[Union[Subdir, AsyncFolder]] = []
+        self.__files: List[AsyncFile] = []
+        self.__parent = parent
+        self.__path = path
+        self.__loaded = False
+        self._self_path_changed(bool(path))
+
+    def __getitem__(self, i: int) -> Union[AsyncFile, "AsyncFolder"]:
+        if i < len(self.__subdirectories):
+            sd = self.__subdirectories[i]
+
+            if isinstance(sd, dict):
+                sd = AsyncFolder(Path(sd["subdir"]), self, self.__ss)
+                self.__subdirectories[i] = sd
+
+            return sd
+
+        return self.__files[i-len(self.__subdirectories)]
+
+    def __iter__(self) -> Iterator[Union[AsyncFile, "AsyncFolder"]]:
+        return map(self.__getitem__, range(len(self.__subdirectories)+len(self.__files)))
+
+    def __repr__(self) -> str:
+        dirs = ", ".join(map(
+            lambda s: str(s) if isinstance(s, AsyncFolder) else str(Path(s["subdir"]).parts[-1]),
+            self.__subdirectories))
+        files = ", ".join(map(str, self.__files))
+
+        return f"AsyncFolder(path={str(self.__path)}, subdirectories=[{dirs}], files=[{files}])"
+
+    def __str__(self) -> str:
+        return self.__path_name
+
+    async def __encoder_chunks(self, _multi_encoder: MultipartEncoder, _body_size: int, _buffer_size: int,
+                               _monitor: Monitor, _callback: Optional[ProgressCallback]) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+
+        yield await loop.run_in_executor(None, _multi_encoder.read, _multi_encoder.len - _body_size)
+        data = await loop.run_in_executor(None, _multi_encoder.read, _buffer_size)
+        while data:
+            _monitor._update(len(data))
+            await notify(_callback, _monitor)
+            yield data
+            data = await loop.run_in_executor(None, _multi_encoder.read, _buffer_size)
+
+    async def __send(self, _file_name: str, _index: int, _multi_encoder: MultipartEncoder, _body_size: int, _buffer_size: int,
+                     _monitor: Monitor, _callback: Optional[ProgressCallback]):
+        headers = {"Content-Type": _multi_encoder.content_type, "Content-Length": str(_multi_encoder.len)}
+        body = self.__encoder_chunks(_multi_encoder, _body_size, _buffer_size, _monitor, _callback)
+
+        async with self.__ss.request("POST", "https://dashboard.blomp.com/dashboard/storage/upload_object",
+                                     data=body, headers=headers) as response:
+            await response.read()
+
+            if not 200 <= response.status < 300:
+                raise ChunkRejectedError(_file_name, _index, response.status)
+
+    async def __uploader(self, _file: BinaryIO, _file_name: str, _file_size: int, _chunk_size: Optional[int], _workers: int,
+                         _buffer_size: int, _close: bool, _monitor: Monitor, _callback: Optional[ProgressCallback]):
+        uuid = str(uuid4())
+
+        try:
+            if _chunk_size is None or _file_size <= _chunk_size:
+                await self.__send(_file_name, 0, self.__encoder(_file_name, _file, _file_size, uuid),
+                                  _file_size, _buffer_size, _monitor, _callback)
+
+            else:
+                loop = asyncio.get_running_loop()
+                chunks = split_range(_file_size, _chunk_size)
+                slots = asyncio.Semaphore(_workers)
+                read_lock = asyncio.Lock()
+
+                async def send_chunk(index: int, offset: int, size: int):
+                    async with slots:
+                        async with read_lock:
+                            await loop.run_in_executor(None, _file.seek, offset)
+                            data = await loop.run_in_executor(None, _file.read, size)
+
+                        me = self.__encoder(_file_name, io.BytesIO(data), _file_size, uuid,
+                                            index, offset, len(data), _chunk_size, len(chunks))
+                        await self.__send(_file_name, index, me, len(data), _buffer_size, _monitor, _callback)
+
+                # The last chunk is only sent after all the others have been received,
+                # since it is the one that makes the server assemble the file.
+                start = _file.seek(0, 1)
+                await asyncio.gather(*(send_chunk(i, start+o, s) for i, (o, s) in enumerate(chunks[:-1])))
+                offset, size = chunks[-1]
+                await send_chunk(len(chunks)-1, start+offset, size)
+        finally:
+            if _close:
+                _file.close()
+
+        await self.reload()
+
+    def __encoder(self, _file_name: str, _file: BinaryIO, _file_size: int, _uuid: str, _index: int = 0, _offset: int = 0,
+                  _current_size: Optional[int] = None, _chunk_size: Optional[int] = None, _chunk_count: int = 1) -> MultipartEncoder:
+        return dropzone_encoder(_file_name, _file, _file_size, _uuid, self.__path_str, self.__ss.token, self.__ss.client_id,
+                                _index, _offset, _current_size, _chunk_size, _chunk_count)
+
+    def _parent_path_changed(self, new_path: Path):
+        self.__path = new_path/self.__path_name
+        self._self_path_changed()
+
+    def _self_path_changed(self, not_is_root: bool = True):
+        self.__path_str = self.__path.as_dir(end_sep=not_is_root)
+
+        try:
+            self.__path_name = self.__path.parts[-1]
+        except IndexError:
+            self.__path_name = ""
+
+        for sd in self.__subdirectories:
+            if isinstance(sd, AsyncFolder):
+                sd._parent_path_changed(self.__path)
+
+        for file in self.__files:
+            file._parent_path_changed(self.__path)
+
+    @property
+    def files(self) -> Tuple[AsyncFile, ...]:
+        """Tuple with all files in this folder"""
+
+        return tuple(self.__files)
+
+    @property
+    def loaded(self) -> bool:
+        """True, if the contents of this folder have already been loaded by the `reload` method"""
+
+        return self.__loaded
+
+    @property
+    def name(self):
+        """Name of this folder"""
+
+        return self.__path_name
+
+    @property
+    def parent(self) -> Optional["AsyncFolder"]:
+        """Parent folder of this folder, if it exists (if this folder is root, None is returned)"""
+
+        return self.__parent
+
+    @property
+    def path(self) -> str:
+        """Path of this folder"""
+
+        return self.__path_str
+
+    @property
+    def subfolders(self) -> Tuple["AsyncFolder", ...]:
+        """Tuple with all subfolders in this folder"""
+
+        return tuple(map(self.__getitem__, range(len(self.__subdirectories))))  # type: ignore
+
+    async def create_folder(self, name: str):
+        """Create a new folder in this directory.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the folder to be created.
+        """
+
+        async with self.__ss.request("POST", "https://dashboard.blomp.com/dashboard/storage/create_folder",
+                                     data={"_token": self.__ss.token, "pseudo-folder": self.__path_str, "folder_name": name+"/"}):
+            pass
+
+    async def delete(self, item: Union[AsyncFile, "AsyncFolder", str]) -> bool:
+        """Deletes a folder or file in this directory.
+
+        Parameters
+        ----------
+        item : AsyncFile or AsyncFolder or `str`
+            If this parameter is an AsyncFile or AsyncFolder object, it must belong to this folder.
+            If this parameter is a string, it must be the name of a folder or file belonging to this folder.
+
+        Returns
+        -------
+        success : `bool`
+            True, if the server reports that the operation was successful, or False otherwise.
+
+        Raises
+        ------
+        FileNotFoundError
+            Raised if `item` parameter is not found in this folder.
+        """
+
+        if isinstance(item, str):
+            item_ = (self.get_file_by_name(item) or
+                     self.__get_subfolder(item))
+            if item_ is None:
+                raise FileNotFoundError("Item not found")
+
+            item = item_
+
+        if isinstance(item, AsyncFile):
+            r = await self.__ss.json("GET", "https://dashboard.blomp.com/dashboard/storage/delete_object",
+                                     params=dict(path=item.file_path))
+
+        else:
+            r = await self.__ss.json("GET", "https://dashboard.blomp.com/dashboard/storage/delete_folder",
+                                     params=dict(folder=item.__path_str))
+
+        return bool(r["response"])
+
+    def get_file_by_name(self, name: str) -> Optional[AsyncFile]:
+        """Finds a file in this folder by name and returns it, if exists.
+
+        Parameters
+        ----------
+        name : `str`
+            File name to find
+
+        Returns
+        -------
+        file : AsyncFile or None
+            If the file is found, then an `AsyncFile` object of it will be returned.
+            Otherwise, None will be returned.
+        """
+
+        for file in self.__files:
+            if file.name == name:
+                return file
+
+    def __get_subfolder(self, name: str) -> Optional["AsyncFolder"]:
+        for i in range(len(self.__subdirectories)):
+            folder = self.__subdirectories[i]
+
+            if isinstance(folder, dict):
+                p = Path(folder["subdir"])
+                if p.parts[-1] == name:
+                    folder = AsyncFolder(p, self, self.__ss)
+                    self.__subdirectories[i] = folder
+                    return folder
+
+            else:
+                if folder.__path_name == name:
+                    return folder
+
+    async def get_folder_by_name(self, name: str) -> Optional["AsyncFolder"]:
+        """Finds a subfolder in this folder by name and returns it, with its contents loaded, if exists.
+
+        Parameters
+        ----------
+        name : `str`
+            Folder name to find
+
+        Returns
+        -------
+        folder : AsyncFolder or None
+            If the folder is found, then an `AsyncFolder` object of it will be returned.
+            Otherwise, None will be returned.
+        """
+
+        folder = self.__get_subfolder(name)
+
+        if folder is not None and not folder.__loaded:
+            await folder.reload()
+
+        return folder
+
+    async def paste(self, file_or_folder: Union[AsyncFile, "AsyncFolder"], cut: bool = False) -> bool:
+        """Pastes a file or folder from another directory into this folder
+
+        Parameters
+        ----------
+        file_or_folder : AsyncFile or AsyncFolder
+            `AsyncFile` or `AsyncFolder` object from another directory to be pasted into this folder.
+        cut : bool, optional
+            If `True`, the file/folder will be cut from its old directory and pasted into this folder.
+            If `False`, the file/folder will be copied to this folder. (Default: False)
+
+        Returns
+        -------
+        success : bool
+            True, if the server reports that the operation was successful, or False otherwise.
+        """
+
+        ff = file_or_folder
+        is_file = isinstance(ff, AsyncFile)
+        params = dict(
+            original_path=ff.file_path if is_file else ff.path,
+            action="move" if cut else "copy",
+            target_path=self.__path_str,
+            file_name=ff.name if is_file else "",
+            type="file" if is_file else "folder"
+        )
+        response = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/file/move", params=params)
+
+        if response == "success":
+            ff._parent_path_changed(self.__path)
+            return True
+
+        return False
+
+    async def reload(self):
+        """This method loads the data in this folder. It must be awaited before accessing the folder contents, and again when there are changes to this folder."""
+
+        folder_data: List[Union[FileData, Subdir]] = (await self.__ss.json(
+            "GET", "https://dashboard.blomp.com/dashboard/folder", params=dict(prefix=self.__path_str)))["data"]
+        subdirectories: List[Subdir] = []
+        self.__files.clear()
+
+        for fd in folder_data:
+            if "subdir" in fd:
+                subdirectories.append(fd)
+                continue
+
+            if fd["content_type"] != "application/directory":
+                self.__files.append(AsyncFile(self.__path, fd, self.__ss))
+
+        large_files = {file.name for file in self.__files if file.size >= 104857600}
+        subdirectories = [sd for sd in subdirectories if Path(sd["subdir"]).parts[-1] not in large_files]
+
+        self.__subdirectories.clear()
+        self.__subdirectories.extend(subdirectories)
+        self.__loaded = True
+
+    async def rename(self, new_name: str) -> bool:
+        """Renames this folder. This method **is unsafe**. Use the `safe_rename` method instead.
+
+        Parameters
+        ----------
+        new_name : `str`
+            New name for this folder.
+
+        Returns
+        -------
+        success : `bool`
+            True, if the server reports that the operation was successful, or False otherwise.
+
+        Warnings
+        --------
+        RuntimeWarning
+            Raised when calling this method due to its unsafe. See the `rename` method of the `Folder` class.
+        """
+
+        if not bool(self.__path):
+            raise PermissionError("Unable to rename root folder")
+
+        from warnings import warn
+        warn('This method may not work correctly. It is recommended to use the "safe_rename" method instead.', RuntimeWarning)
+
+        r = await self.__ss.text("GET", "https://dashboard.blomp.com/dashboard/file/rename",
+                                 params=dict(original_name=self.__path_name, type="folder", name=new_name, path=self.__path_str))
+
+        success = r == "success"
+        if success:
+            self.__path = self.__path.parent/new_name
+            self._self_path_changed()
+
+        return success
+
+    async def safe_rename(self, new_name: str):
+        """Renames this folder. Use this method instead of `rename` method.
+
+        Parameters
+        ----------
+        new_name : `str`
+            New name for this folder.
+
+        Notes
+        -----
+        See the `safe_rename` method of the `Folder` class.
+        """
+
+        if self.__parent is None:
+            raise PermissionError("Unable to rename root folder")
+
+        if not self.__loaded:
+            await self.reload()
+
+        await self.__parent.create_folder(new_name)
+        await self.__parent.reload()
+        new_folder: AsyncFolder = self.__parent.__get_subfolder(new_name)  # type: ignore
+
+        for ff in self:
+            await new_folder.paste(ff, True)
+
+        await self.__parent.delete(self)
+        self.__path = new_folder.__path
+        self._self_path_changed()
+
+    def upload(self, file: Union[str, pathlib.Path, BinaryIO], file_name: Optional[str] = None, replace_if_exists: bool = False,
+               buffer_size: int = 8192, chunk_size: Optional[int] = None, workers: int = 4,
+               callback: Optional[ProgressCallback] = None) -> Tuple["asyncio.Task[None]", Monitor]:
+        """Upload a file to this folder. Must be called from a running event loop.
+
+        Parameters
+        ----------
+        file : `str` or `pathlib.Path` or file-like object
+            If this parameter is a string or a Path, then this must be a path to an existing file.
+            If this parameter is a file-like object, then its contents will be uploaded.
+        file_name : `str`, optional
+            If specified, then the file will have the name specified in this parameter in the Blomp Cloud.
+            Otherwise (`file_name=None`), the file name will be obtained automatically if possible.
+            (Default: None)
+        replace_if_exists : bool, optional
+            Parameter considered only when a file with the same name already exists in this folder.
+            If True, the existing file is replaced by the new one to be uploaded.
+            If False, `FileExistsError` is raised. (Default: False)
+        buffer_size : int, optional
+            Size, in bytes, of the content uploaded in each iteration. (Default: 8192)
+        chunk_size : int, optional
+            If specified, and the file is larger than this value, the file will be split into chunks of `chunk_size` bytes,
+            each one sent in a separate request. The file must be seekable. (Default: None)
+        workers : int, optional
+            Maximum number of chunks sent at the same time. Only considered when the file is uploaded in chunks. (Default: 4)
+        callback : callable, optional
+            Function or coroutine function called with the upload monitor after each iteration. (Default: None)
+
+        Returns
+        -------
+        upload_task : `asyncio.Task`
+            A task responsible for uploading the file, which can be awaited.
+        upload_monitor : UploadMonitor
+            An object that can be used to monitor upload progress.
+
+        Raises
+        ------
+        ValueError
+            Raised when the file name or size cannot be automatically determined if the `file_name` parameter are not specified,
+            or when `chunk_size` or `workers` are not positive.
+        FileExistsError
+            Raised when a file with the same name already exists in this directory, and the `replace_if_exists` parameter is False.
+        """
+
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError('"chunk_size" must be greater than zero')
+
+        if workers <= 0:
+            raise ValueError('"workers" must be greater than zero')
+
+        close = False
+        if isinstance(file, (str, pathlib.Path)):
+            file = open(file, 'rb')
+            close = True
+
+        if not file_name:
+            if not hasattr(file, "name"):
+                raise ValueError('Unable to determine file name. The "file_name" parameter must be specified')
+
+            file_name = pathlib.Path(file.name).parts[-1]  # type: ignore
+
+        file_size = get_file_size(file)
+
+        if not replace_if_exists:
+            for f in self.__files:
+                if f.name == file_name:
+                    raise FileExistsError('A file with same was found. Set the "replace_if_exists" parameter to True to replace the old file or set "file_name" parameter')
+
+        monitor = UploadMonitor(file_size)
+        task = asyncio.ensure_future(self.__uploader(file, file_name, file_size, chunk_size, workers,
+                                                     buffer_size, close, monitor, callback))
+
+        monitor._start()
+        task.add_done_callback(monitor._finish_task)
+
+        return task, monitor
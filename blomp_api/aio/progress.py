@@ -0,0 +1,17 @@
+from ..utils.monitor import Monitor
+
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import inspect
+
+
+ProgressCallback = Callable[[Monitor], Union[Awaitable[Any], Any]]
+
+
+async def notify(callback: Optional[ProgressCallback], monitor: Monitor):
+    """Calls a progress callback with a monitor, awaiting its result if it is awaitable"""
+
+    if callback is not None:
+        result = callback(monitor)
+        if inspect.isawaitable(result):
+            await result
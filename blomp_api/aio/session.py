@@ -0,0 +1,91 @@
+from ..utils.user_agent import get_user_agent
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+import asyncio
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError('The asyncio client requires the "aiohttp" package. Install it with "pip install blomp-api[async]"') from e
+
+
+class AsyncSession:
+    """HTTP session of the asyncio client, which limits the number of requests in progress at the same time.
+
+    Parameters
+    ----------
+    max_concurrency : `int`, optional
+        Maximum number of requests in progress at the same time. (Default: 100)
+    """
+
+    def __init__(self, max_concurrency: int = 100):
+        if max_concurrency <= 0:
+            raise ValueError("Maximum concurrency must be greater than zero")
+
+        self.__max_concurrency = max_concurrency
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        self.__client: Optional[aiohttp.ClientSession] = None
+        self.__token: str = ""
+        self.__client_id: int = 0
+        self.headers = {"User-Agent": get_user_agent(), "Referer": "https://www.blomp.com/"}
+
+    @property
+    def client(self) -> aiohttp.ClientSession:
+        """Underlying `aiohttp` session, created on first use"""
+
+        if self.__client is None or self.__client.closed:
+            connector = aiohttp.TCPConnector(limit=self.__max_concurrency)
+            self.__client = aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+        return self.__client
+
+    @property
+    def client_id(self) -> int:
+        return self.__client_id
+
+    @client_id.setter
+    def client_id(self, id_: int):
+        self.__client_id = id_
+
+    @property
+    def token(self) -> str:
+        return self.__token
+
+    @token.setter
+    def token(self, tok: str):
+        self.__token = tok
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Makes a request, waiting if the maximum number of requests in progress has been reached.
+        The request is considered in progress until the context ends, so the response body must be read inside it."""
+
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+        async with self.__semaphore:
+            async with self.client.request(method, url, **kwargs) as response:
+                yield response
+
+    async def text(self, method: str, url: str, **kwargs: Any) -> str:
+        """Makes a request and returns the response body as text"""
+
+        async with self.request(method, url, **kwargs) as response:
+            return await response.text()
+
+    async def json(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Makes a request and returns the response body decoded from JSON"""
+
+        async with self.request(method, url, **kwargs) as response:
+            return await response.json(content_type=None)
+
+    async def close(self):
+        """Closes the session"""
+
+        if self.__client is not None:
+            await self.__client.close()
+
+
+__all__ = ["AsyncSession"]
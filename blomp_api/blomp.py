@@ -1,9 +1,16 @@
+from .utils.hedging import HedgingPolicy
+from .utils.listing_cache import ListingCache
+from .utils.prefetcher import Prefetcher
+from .utils.rate_limiter import BandwidthLimiter
+from .utils.retry_policy import RetryPolicy
+from .utils.scraping import parse_account_info, parse_login_page
 from .utils.user_agent import get_user_agent
 from .utils.session import Session
 from .fso import *
 
-from typing import Optional
-import re
+from threading import Lock
+from typing import Dict, Optional, Union
+import pathlib
 
 
 class Blomp:
@@ -16,6 +23,22 @@ class Blomp:
         Blomp account e-mail
     password : `str`
         Blomp account password
+    pool_size : `int`, optional
+        Maximum number of keep-alive connections kept open at the same time to each host. (Default: 10)
+    listing_cache : ListingCache, optional
+        If specified, folder listings are stored in this cache and reused when folders are loaded. (Default: None)
+    prefetcher : Prefetcher, optional
+        If specified, the listings of subfolders are loaded in background when the contents of a folder are first accessed. (Default: None)
+    bandwidth_limiter : BandwidthLimiter, optional
+        If specified, all uploads and downloads share the rate limits of this limiter. (Default: None)
+    retry_policy : RetryPolicy, optional
+        Timeouts and retry rules of the requests. If None, the default `RetryPolicy` is used. (Default: None)
+    hedging : HedgingPolicy, optional
+        If specified, slow folder listing and share information requests are sent again, using the first response.
+        (Default: None)
+    session_file : `str` or `pathlib.Path`, optional
+        If specified, the login session is saved to this file and reused by the next instances, avoiding signing in
+        again on each startup. The session is renewed automatically when it expires. (Default: None)
 
     Raises
     ------
@@ -23,12 +46,32 @@ class Blomp:
         Raised if e-mail and/or password entered is incorrect, or if connection to server fails.
     """
 
-    def __init__(self, email: str, password: str):
-        self.__ss = Session()
+    def __init__(self, email: str, password: str, pool_size: int = 10, listing_cache: Optional[ListingCache] = None,
+                 prefetcher: Optional[Prefetcher] = None, bandwidth_limiter: Optional[BandwidthLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedging: Optional[HedgingPolicy] = None,
+                 session_file: Optional[Union[str, pathlib.Path]] = None):
+        self.__email = email
+        self.__password = password
+        self.__session_file = session_file
+        self.__account_info: Optional[Dict[str, str]] = None
+        self.__account_lock = Lock()
+
+        self.__ss = Session(pool_size, retry_policy)
+        self.__ss.hedging = hedging
+        self.__ss.listing_cache = listing_cache
+        self.__ss.prefetcher = prefetcher
+        self.__ss.bandwidth_limiter = bandwidth_limiter
         self.__ss.headers["User-Agent"] = get_user_agent()
         self.__ss.headers["Referer"] = "https://www.blomp.com/"
+        self.__ss.authenticator = self.__login
+
+        if session_file is None or not self.__ss.load_state(session_file, email):
+            self.__ss.authenticate()
+
+    def __login(self):
+        self.__ss.cookies.clear()
         p = self.__ss.post("https://dashboard.blomp.com/authorize",
-                           data={"email": email, "password": password})
+                           data={"email": self.__email, "password": self.__password})
 
         if p.url == "https://dashboard.blomp.com":
             raise ConnectionError("Incorrect email or password")
@@ -37,33 +80,30 @@ class Blomp:
             raise ConnectionError(f"Login returned status code {p.status_code}")
 
         content = next(p.iter_content(8192, True))
-        self.__ss.token = re.findall(r'<meta name="csrf-token" content="(.+)"\x20?/?>', content)[0]
-        self.__ss.client_id = int(re.findall(r'<input type="hidden" id="clientId" value="(\d+)">', content)[0])
-
-        index_page = self.__ss.get("https://dashboard.blomp.com/dashboard/index").text
-        blomp_info = dict(
-            used_storage=re.search(r'<h5>Used Storage: (.+)</h5>', index_page),
-            avaliable_storage=re.search(r'<h5>Available Storage: (.+)</h5>', index_page),
-            storage_capacity=re.search(r'Storage Capacity:\n(.+)</h5>', index_page),
-            shared_files=re.search(r'<h5>Shared Files: (.+)</h5>', index_page),
-            files_and_folders=re.search(r'<h5>Files & Folders: (.+)</h5>', index_page)
-        )
-
-        for attr, match in blomp_info.items():
-            if match:
-                setattr(self, "__"+attr, match.groups()[0])
+        self.__ss.token, self.__ss.client_id = parse_login_page(content)
+
+        if self.__session_file is not None:
+            self.__ss.save_state(self.__session_file, self.__email)
+
+    def __info(self, _key: str) -> Optional[str]:
+        with self.__account_lock:
+            if self.__account_info is None:
+                index_page = self.__ss.get("https://dashboard.blomp.com/dashboard/index").text
+                self.__account_info = parse_account_info(index_page)
+
+            return self.__account_info.get(_key)
 
     @property
     def available_storage(self) -> Optional[str]:
         """Available storage in Blomp account, or None if this information cannot be obtained."""
 
-        return getattr(self, "__avaliable_storage", None)
+        return self.__info("avaliable_storage")
 
     @property
     def files_and_folders(self) -> Optional[int]:
         """Number of stored files and folders, or None if this information cannot be obtained."""
 
-        ff: Optional[str] = getattr(self, "__files_and_folders", None)
+        ff: Optional[str] = self.__info("files_and_folders")
 
         if isinstance(ff, str):
             return int(ff)
@@ -74,7 +114,7 @@ class Blomp:
     def shared_files(self) -> Optional[int]:
         """Number of shared files, or None if this information cannot be obtained."""
 
-        ff: Optional[str] = getattr(self, "__shared_files", None)
+        ff: Optional[str] = self.__info("shared_files")
 
         if isinstance(ff, str):
             return int(ff)
@@ -85,7 +125,7 @@ class Blomp:
     def storage_capacity(self) -> Optional[str]:
         """Total storage in the Blomp account, or None if this information cannot be obtained."""
 
-        ff: Optional[str] = getattr(self, "__storage_capacity", None)
+        ff: Optional[str] = self.__info("storage_capacity")
 
         if isinstance(ff, str):
             return ff.strip()
@@ -96,9 +136,16 @@ class Blomp:
     def used_storage(self) -> Optional[str]:
         """Used storage in the Blomp account, or None if this information cannot be obtained."""
 
-        return getattr(self, "__used_storage", None)
+        return self.__info("used_storage")
+
+    def refresh_account_info(self):
+        """Discards the account information loaded, so that it is loaded again when one of its properties is accessed.
+        The account information is only loaded when first accessed."""
+
+        with self.__account_lock:
+            self.__account_info = None
 
     def get_root_directory(self) -> Folder:
-        """Returns a Folder object from the root directory"""
+        """Returns a Folder object from the root directory. Its contents are loaded when first accessed."""
 
         return Folder("", None, self.__ss)
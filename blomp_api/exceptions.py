@@ -0,0 +1,50 @@
+from concurrent.futures import CancelledError
+from typing import Optional
+
+
+class TransferCancelledError(CancelledError):
+    """Raised inside a transfer when it is cancelled while running"""
+
+
+class IntegrityError(Exception):
+    """Raised when the MD5 hash of transferred content does not match the hash of its source
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the transferred file.
+    expected : `str`
+        MD5 hash of the source: the hash stored in the Blomp Cloud, for downloads, or the hash of the local content, for uploads.
+    actual : `str`
+        MD5 hash of the received content: the hash of the downloaded content, or the hash reported by the server, for uploads.
+    """
+
+    def __init__(self, name: str, expected: str, actual: str):
+        super().__init__(f'MD5 hash of "{name}" does not match: expected {expected}, got {actual}')
+        self.name = name
+        self.expected = expected
+        self.actual = actual
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a request is not sent because the server has failed too many times in a row"""
+
+
+class ChunkRejectedError(ConnectionError):
+    """Raised when the server responds to an upload, or to a chunk of a chunked upload, with an error status
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the uploaded file.
+    index : `int`
+        Index of the rejected chunk, or 0, if the upload is not chunked.
+    status : `int`, optional
+        Status code of the response, or None, if it has no status.
+    """
+
+    def __init__(self, name: str, index: int, status: Optional[int]):
+        super().__init__(f'Chunk {index} of the upload of "{name}" returned status code {status}')
+        self.name = name
+        self.index = index
+        self.status = status
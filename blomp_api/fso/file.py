@@ -1,36 +1,55 @@
+from ..exceptions import IntegrityError
 from ..response_types import FileData, ShareLinkResponse
+from ..utils.integrity import OrderedHasher
 from ..utils.monitor import DownloadMonitor, Monitor
 from ..utils.path import Path
+from ..utils.ranges import split_range
+from ..utils.rate_limiter import TokenBucket, limit_rate
 from ..utils.session import Session
+from ..utils.share import email_field
+from ..utils.sink import FileSink
+from ..utils.transfer_manager import TransferFuture, TransferManager, start_transfer
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from requests import Response
-from threading import Thread
-from typing import BinaryIO, Callable, Iterable, Optional, Tuple, Union
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
 import os
 import pathlib
+import re
+
+if TYPE_CHECKING:
+    from .folder import Folder
 
 
 class File:
     """Class to manipulate a file stored in the Blomp Cloud"""
 
-    def __init__(self, path: Union[Path, str], dataobj: FileData, session: Session):
+    __slots__ = ("__hash", "__last_modified", "__last_modified_str", "__length", "__name", "__content_type", "__ss", "__path",
+                 "__parent", "__file_id", "__share_status", "__link", "__file_path")
+
+    def __init__(self, path: Union[Path, str], dataobj: FileData, session: Session, parent: Optional["Folder"] = None):
         if isinstance(path, str):
             path = Path(path)
 
         self.__hash: str = dataobj["hash"]
-        self.__last_modified: datetime = datetime.fromisoformat(dataobj["last_modified"])
+        self.__last_modified: Optional[datetime] = None
+        self.__last_modified_str: str = dataobj["last_modified"]
         self.__length: int = dataobj["bytes"]
-        self.__name: str = Path(dataobj["name"]).parts[-1]
+        self.__name: str = dataobj["name"].replace("\\", "/").rstrip("/").rpartition("/")[2]
         self.__content_type: str = dataobj["content_type"]
 
         self.__ss = session
         self.__path = path
+        self.__parent = parent
         self.__file_id: Optional[int] = None
         self.__share_status: Optional[bool] = None
         self.__link: Optional[str] = None
-        self.__file_path: str = str(self.__path/Path(self.__name))
+        self.__file_path: Optional[str] = None
+
+    __SINK_BLOCK_SIZE = 1 << 20
 
     def __hash__(self) -> int:
         return int(self.__hash, 16)
@@ -44,22 +63,277 @@ class File:
     def __str__(self) -> str:
         return self.__name
 
-    def __downloader(self, _response: Response, _file: BinaryIO, _buffer_size: int, _close: bool, _update_func: Callable[[int], None]):
-        for chunk in _response.iter_content(_buffer_size):
-            _update_func(_file.write(chunk))
-            _file.flush()
+    def __downloader(self, _target: Union[pathlib.Path, FileSink, BinaryIO], _buffer_size: int, _segments: int, _close: bool,
+                     _resume: bool, _verify: bool, _update_func: Callable[[int], None], _buckets: Sequence[TokenBucket]):
+        target = _target
+        update = limit_rate(_update_func, _buckets)
+
+        # Each segment holds a connection, so there are no more segments than connections in the session pool
+        _segments = min(_segments, self.__ss.connection_pool.maxsize)
+
+        try:
+            if isinstance(target, pathlib.Path):
+                target = self.__sink(target, _resume)
+
+            if isinstance(target, FileSink):
+                hasher = OrderedHasher(target.read_at) if _verify else None
+                self.__sink_download(target, _segments, max(_buffer_size, self.__SINK_BLOCK_SIZE), hasher, update, _update_func)
+
+                try:
+                    self.__verify(hasher)
+                except IntegrityError:
+                    # The content is corrupted, so it must not be resumed
+                    target.reset()
+                    raise
+
+                target.commit()
+                return
+
+            ranges = split_range(self.__length, -(-self.__length//_segments)) if self.__length else []
+
+            if len(ranges) > 1:
+                r = self.__download_request(*ranges[0])
+            else:
+                r = self.__download_request()
+
+            # Verifying a segmented download requires reading back the segments that arrive ahead of the others
+            if len(ranges) > 1 and self.__is_range(r, *ranges[0]) and target.seekable() and (not _verify or target.readable()):
+                hasher = self.__segmented_download(r, target, ranges, _buffer_size, _verify, update)
+
+            else:
+                if len(ranges) > 1 and r.status_code != 200:
+                    r.close()
+                    r = self.__download_request()
+
+                self.__check_content(r)
+                hasher = OrderedHasher() if _verify else None
+                self.__copy_response(r, self.__hashing(lambda _, data: target.write(data), hasher), 0, _buffer_size, update)
+                target.flush()
+
+            self.__verify(hasher)
+        finally:
+            if isinstance(target, FileSink):
+                target.abort()
+            elif _close and not isinstance(target, pathlib.Path):
+                target.close()
+
+    def __sink(self, _path: pathlib.Path, _resume: bool) -> FileSink:
+        identity = None
+        if _resume:
+            identity = dict(path=self.file_path, hash=self.__hash, size=self.__length, last_modified=self.__last_modified_str)
+
+        return FileSink(_path, self.__length, identity)
+
+    def __sink_download(self, _sink: FileSink, _segments: int, _block_size: int, _hasher: Optional[OrderedHasher],
+                        _update_func: Callable[[int], None], _credit_func: Callable[[int], None]):
+        write = self.__hashing(_sink.write_at, _hasher)
+        missing = _sink.missing_ranges()
+
+        # Bytes written by an interrupted download are not downloaded again
+        completed = self.__length-sum(size for _, size in missing)
+        if completed:
+            _credit_func(completed)
+
+            if _hasher is not None:
+                for offset, size in _sink.completed_ranges():
+                    _hasher.written(offset, size)
+
+        if not missing:
+            return
+
+        part_size = -(-sum(size for _, size in missing)//_segments)
+        ranges = [(offset+o, s) for offset, size in missing for o, s in split_range(size, part_size)]
+
+        if ranges == [(0, self.__length)]:
+            return self.__copy_response(self.__check_content(self.__download_request()), write, 0, _block_size,
+                                        _update_func)
+
+        r = self.__download_request(*ranges[0])
+
+        if r.status_code == 206 and not self.__is_range(r, *ranges[0]):
+            r.close()
+            offset, size = ranges[0]
+            raise ConnectionError(f"The server did not return the requested byte range {offset}-{offset+size-1} of {self.__name}")
+
+        if r.status_code != 206:
+            # The server ignored the range, so the whole content is being sent, unless the response is an error,
+            # which keeps the bytes already written
+            self.__check_content(r)
+            _sink.reset()
+            if _hasher is not None:
+                _hasher.reset()
+            if completed:
+                _credit_func(-completed)
+
+            return self.__copy_response(r, write, 0, _block_size, _update_func)
+
+        def fetch_range(offset: int, size: int):
+            self.__copy_response(self.__range_request(offset, size), write, offset, _block_size, _update_func)
+
+        with ThreadPoolExecutor(min(len(ranges), _segments)) as executor:
+            futures = [executor.submit(self.__copy_response, r, write, ranges[0][0], _block_size, _update_func)]
+            futures.extend(executor.submit(fetch_range, *rg) for rg in ranges[1:])
+
+            for future in futures:
+                future.result()
+
+    def __segmented_download(self, _response: Response, _file: BinaryIO, _ranges: List[Tuple[int, int]], _buffer_size: int,
+                             _verify: bool, _update_func: Callable[[int], None]) -> Optional[OrderedHasher]:
+        lock = Lock()
+        start = _file.seek(0, 1)
+        _file.truncate(start+self.__length)
+
+        def write(offset: int, data: memoryview):
+            with lock:
+                _file.seek(start+offset)
+                _file.write(data)
+
+        def read_at(offset: int, size: int) -> bytes:
+            with lock:
+                _file.seek(start+offset)
+                return _file.read(size)
+
+        hasher = OrderedHasher(read_at) if _verify else None
+        write_at = self.__hashing(write, hasher)
+
+        def fetch_segment(offset: int, size: int):
+            self.__copy_response(self.__range_request(offset, size), write_at, offset, _buffer_size, _update_func)
+
+        with ThreadPoolExecutor(len(_ranges)) as executor:
+            futures = [executor.submit(self.__copy_response, _response, write_at, 0, _buffer_size, _update_func)]
+            futures.extend(executor.submit(fetch_segment, *r) for r in _ranges[1:])
+
+            for future in futures:
+                future.result()
+
+        _file.flush()
+        _file.seek(start+self.__length)
+
+        return hasher
+
+    def __verify(self, _hasher: Optional[OrderedHasher]):
+        if _hasher is not None and _hasher.hexdigest() != self.__hash.lower():
+            raise IntegrityError(self.__name, self.__hash, _hasher.hexdigest())
+
+    @staticmethod
+    def __hashing(_write_func: Callable[[int, memoryview], object],
+                  _hasher: Optional[OrderedHasher]) -> Callable[[int, memoryview], object]:
+        if _hasher is None:
+            return _write_func
+
+        def write(offset: int, data: memoryview):
+            _write_func(offset, data)
+            _hasher.update(offset, data)
+
+        return write
+
+    @staticmethod
+    def __copy_response(_response: Response, _write_func: Callable[[int, memoryview], object], _offset: int, _block_size: int,
+                        _update_func: Callable[[int], None]):
+        # Fills a reused buffer straight from the socket, so that every write but the last one has the full block size
+        raw = _response.raw
+        raw.decode_content = True
+        buffer = memoryview(bytearray(_block_size))
+
+        with _response:
+            while True:
+                size = 0
+                while size < _block_size:
+                    n = raw.readinto(buffer[size:])
+                    if not n:
+                        break
+                    size += n
+
+                if size:
+                    _write_func(_offset, buffer[:size])
+                    _update_func(size)
+                    _offset += size
+
+                if size < _block_size:
+                    break
+
+    def __download_request(self, _offset: Optional[int] = None, _size: Optional[int] = None) -> Response:
+        headers = {}
+        if _offset is not None and _size is not None:
+            headers["Range"] = f"bytes={_offset}-{_offset+_size-1}"
+
+        return self.__ss.get("https://dashboard.blomp.com/dashboard/storage/download_object", stream=True, headers=headers,
+                             params=dict(path=self.file_path, filename=self.__name, size=self.__length))
+
+    def __range_request(self, _offset: int, _size: int) -> Response:
+        r = self.__download_request(_offset, _size)
+
+        if not self.__is_range(r, _offset, _size):
+            r.close()
+            raise ConnectionError(f"The server did not return the requested byte range {_offset}-{_offset+_size-1} of {self.__name}")
+
+        return r
+
+    def __check_content(self, _response: Response) -> Response:
+        # Any status other than 200 means that the body is not the content of this file, such as an error page
+        if _response.status_code != 200:
+            _response.close()
+            raise ConnectionError(f"The server did not send the content of {self.__name} (HTTP status {_response.status_code})")
+
+        return _response
+
+    @staticmethod
+    def __is_range(_response: Response, _offset: int, _size: int) -> bool:
+        """Checks whether a response contains exactly the requested byte range"""
+
+        if _response.status_code != 206:
+            return False
 
-        if _close:
-            _file.close()
+        match = re.fullmatch(r"bytes (\d+)-(\d+)/(?:\d+|\*)", _response.headers.get("Content-Range", "").strip())
+        return match is not None and (int(match[1]), int(match[2])) == (_offset, _offset+_size-1)
+
+    def _parent_changed(self, parent: "Folder") -> Optional["Folder"]:
+        """Moves this file to another parent folder, and returns the old one, which is in charge of removing it"""
+
+        old_parent, self.__parent = self.__parent, parent
+
+        return old_parent
 
     def _parent_path_changed(self, new_path: Path):
         self.__path = new_path
-        self.__file_path: str = str(self.__path/Path(self.__name))
+        self.__file_path = None
+        self.__file_id = None
+
+    def _share_switch(self, status: bool) -> bool:
+        """Enables or disables sharing of this file, without a request if it is already in the given status"""
+
+        if self.__file_id is None:
+            self.__share_info()
+
+        if self.__share_status == status:
+            return True
+
+        r = self.__ss.get("https://dashboard.blomp.com/dashboard/file/share/switch",
+                          params=dict(status=int(status), id=self.__file_id))
+
+        if r.text != "success":
+            # The status is unknown, so it is requested again on the next use
+            self.__file_id = None
+            self.__ss.invalidate_share_link(self.file_path)
+            return False
+
+        self.__share_status = status
+
+        info = self.__ss.share_link(self.file_path)
+        if info is not None:
+            self.__ss.store_share_link(self.file_path, {**info, "status": int(status)})
+
+        return True
 
     def __share_info(self):
-        info: ShareLinkResponse = self.__ss.get("https://dashboard.blomp.com/dashboard/file/share/link",
-                                                params=dict(path=self.__file_path, size=self.__length)).json()["info"]
-        info["link"] = f"https://sharedby.blomp.com/{info['link']}"
+        info: Optional[ShareLinkResponse] = self.__ss.share_link(self.file_path)
+
+        if info is None:
+            info = self.__ss.get("https://dashboard.blomp.com/dashboard/file/share/link",
+                                 params=dict(path=self.file_path, size=self.__length)).json()["info"]
+            info["link"] = f"https://sharedby.blomp.com/{info['link']}"
+            self.__ss.store_share_link(self.file_path, info)
+
         self.__file_id = info["id"]
         self.__share_status = bool(info["status"])
         self.__link = info["link"]
@@ -74,12 +348,18 @@ class File:
     def file_path(self) -> str:
         """Full file path"""
 
+        if self.__file_path is None:
+            self.__file_path = self.__path.as_dir(end_sep=bool(self.__path))+self.__name
+
         return self.__file_path
 
     @property
     def last_modified(self) -> datetime:
         """Date and time the file was last modified"""
 
+        if self.__last_modified is None:
+            self.__last_modified = datetime.fromisoformat(self.__last_modified_str)
+
         return self.__last_modified
 
     @property
@@ -100,7 +380,9 @@ class File:
 
         return self.__length
 
-    def download(self, file_or_path: Union[str, pathlib.Path, BinaryIO] = "", buffer_size: int = 8192) -> Tuple[Thread, Monitor]:
+    def download(self, file_or_path: Union[str, pathlib.Path, BinaryIO] = "", buffer_size: int = 8192, segments: int = 1,
+                 manager: Optional[TransferManager] = None, priority: int = 0,
+                 resume: bool = False, verify: bool = False) -> Tuple[Union[Thread, TransferFuture], Monitor]:
         """Downloads the file to a specified directory or file-like object.
 
         Parameters
@@ -109,23 +391,44 @@ class File:
             If this parameter is a string or a Path, then it can be a directory or file path.
             If the parameter value exists as a directory, then the file will be saved in this directory with the same name as this file.
             Otherwise (path + file name or just the file name), the parameter will be opened as a file, with its contents being saved there.
+            The content is saved to a temporary file in the same directory, which replaces the target file once the download is complete.
 
             If this parameter is a file-like object, the content will be saved in it.
         buffer_size : int, optional
-            Size, in bytes, of the content downloaded in each iteration. (Default: 8192)
+            Size, in bytes, of the content downloaded in each iteration.
+            When saving to a path, the content is written in blocks of at least 1 MiB. (Default: 8192)
+        segments : int, optional
+            Number of byte ranges in which the file is split to be downloaded at the same time,
+            limited to the `pool_size` of the session. Each range is written at its offset in the output file, which must be seekable.
+            If the server does not support range requests, the file is downloaded in a single stream. (Default: 1)
+        manager : TransferManager, optional
+            If specified, the download is submitted to this manager instead of running in a new thread.
+            In this case, the output file is only opened when the download starts. (Default: None)
+        priority : `int`, optional
+            Priority of the download in the manager. Only considered when `manager` is specified. (Default: 0)
+        resume : `bool`, optional
+            If True, the progress of the download is saved in a checkpoint next to the output file, and a previous download
+            interrupted in the same path continues from the byte ranges still missing. If the remote file has changed since then,
+            the download starts from the beginning. Only supported when `file_or_path` is a path. (Default: False)
+        verify : `bool`, optional
+            If True, the MD5 hash of the content is computed while it is downloaded and compared with `md5_hash` at the end,
+            raising `IntegrityError` in the download if they do not match. In this case, a path is left untouched.
+            In segmented downloads, a file-like object must also be readable, otherwise the file is downloaded in a single stream.
+            (Default: False)
 
         Returns
         -------
-        download_thread : `threading.Thread`
-            A function thread responsible for downloading the file.
+        download_thread : `threading.Thread` or TransferFuture
+            A function thread responsible for downloading the file, or a future, if `manager` is specified.
         download_monitor : DownloadMonitor
             An object that can be used to monitor download progress.
         """
 
+        if segments <= 0:
+            raise ValueError('"segments" must be greater than zero')
+
         fp = file_or_path
         close = False
-        r = self.__ss.get("https://dashboard.blomp.com/dashboard/storage/download_object", stream=True,
-                          params=dict(path=self.__file_path, filename=self.__name, size=self.__length))
 
         if isinstance(fp, (str, pathlib.Path)):
             if isinstance(fp, str):
@@ -134,15 +437,20 @@ class File:
             if os.path.isdir(fp):
                 fp /= pathlib.Path(self.__name)
 
-            fp = open(fp, 'wb')
-            close = True
+            if manager is None:
+                fp = self.__sink(fp, resume)
+
+        elif resume:
+            raise ValueError('"resume" is only supported when downloading to a path')
+
+        limiters = (self.__ss.bandwidth_limiter, manager.bandwidth_limiter if manager is not None else None)
+        buckets = [limiter.download for limiter in limiters if limiter is not None]
 
         monitor = DownloadMonitor(self.__length)
-        thread = Thread(target=self.__downloader, args=(
-            r, fp, buffer_size, close, monitor._update))
-        thread.start()
+        handle = start_transfer(self.__downloader, (fp, buffer_size, segments, close, resume, verify, monitor._update, buckets),
+                                monitor, manager, priority)
 
-        return thread, monitor
+        return handle, monitor
 
     def rename(self, new_name: str) -> bool:
         """Rename this file
@@ -164,7 +472,14 @@ class File:
 
         success = r.text == "success"
         if success:
-            self.__name = new_name
+            self.__ss.invalidate_listing(path_)
+            self.__ss.invalidate_share_link(self.file_path)
+            old_name, self.__name = self.__name, new_name
+            self.__file_path = None
+
+            if self.__parent is not None:
+                self.__parent._file_renamed(self, old_name)
+
             self.__share_info()
 
         return success
@@ -187,18 +502,13 @@ class File:
 
         perm = int(bool(anyone_can_view))
 
-        if emails:
-            if not all(map(lambda o: isinstance(o, str), emails)):
-                raise TypeError("All e-mails must be string")
-            emails = str(emails).replace(" ", '')
-        else:
-            emails = ""
+        email = email_field(emails)
 
         if self.__file_id is None:
             self.__share_info()
 
         self.__ss.post("https://dashboard.blomp.com/dashboard/file/share/send",
-                       data=dict(_token=self.__ss.token, email=emails,
+                       data=dict(_token=self.__ss.token, email=email,
                                  link=self.__link, permission=perm),
                        allow_redirects=False)
 
@@ -219,11 +529,7 @@ class File:
         if not self.__share_status:
             raise Exception("This file is not being shared")
 
-        r = self.__ss.get("https://dashboard.blomp.com/dashboard/file/share/switch",
-                          params=dict(status=0, id=self.__file_id))
-        self.__share_status = False
-
-        return r.text == "success"
+        return self._share_switch(False)
 
     def share_switch_on(self) -> bool:
         """Disables sharing of this file.
@@ -240,8 +546,4 @@ class File:
         if self.__share_status:
             raise Exception("This file is already being shared")
 
-        r = self.__ss.get("https://dashboard.blomp.com/dashboard/file/share/switch",
-                          params=dict(status=1, id=self.__file_id))
-        self.__share_status = True
-
-        return r.text == "success"
+        return self._share_switch(True)
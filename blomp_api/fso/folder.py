@@ -1,23 +1,39 @@
+from ..exceptions import ChunkRejectedError, IntegrityError
 from ..response_types import FileData, Subdir
+from ..utils.dropzone import dropzone_encoder, envelope_epilogue, get_file_size, map_file, split_envelope
+from ..utils.json_stream import iter_json_array
 from ..utils.monitor import Monitor, UploadMonitor
 from ..utils.path import Path
+from ..utils.ranges import split_range
+from ..utils.rate_limiter import TokenBucket, limit_rate
 from ..utils.session import Session
+from ..utils.transfer_manager import TransferFuture, TransferManager, start_transfer
+from ..utils.upload_state import UploadState, default_state_directory
 from . import File
 
-from http.client import HTTPSConnection, ResponseNotReady
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from http.client import HTTPException, HTTPSConnection, IncompleteRead, ResponseNotReady
 from requests_toolbelt import MultipartEncoder
-from requests_toolbelt.multipart.encoder import total_len
-from threading import Thread
-from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+from threading import BoundedSemaphore, Lock, RLock, Thread
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar, Union
 from urllib.request import Request
 from uuid import uuid4
 
-import mimetypes
+import hashlib
+import io
 import pathlib
+import time
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 class Folder:
-    """Class to manipulate a folder stored in the Blomp Cloud"""
+    """Class to manipulate a folder stored in the Blomp Cloud.
+
+    The contents of the folder are loaded when they are first accessed.
+    """
 
     def __init__(self, path: Union[str, Path], parent: Optional["Folder"], session: Session):
         if isinstance(path, str):
@@ -26,27 +42,39 @@ class Folder:
         self.__ss = session
         self.__subdirectories: List[Union[Subdir, Folder]] = []
         self.__files: List[File] = []
+        self.__file_index: Dict[str, int] = {}
+        self.__folder_index: Dict[str, int] = {}
+        self.__removed_files: Set[int] = set()
+        self.__removed_folders: Set[int] = set()
         self.__parent = parent
         self.__path = path
+        self.__deferred_reloads = 0
+        self.__reload_pending = False
+        self.__pending_verifications: List[Tuple[str, str]] = []
+        self.__reload_lock = Lock()
+        self.__loaded = False
+        self.__prefetched = False
+        self.__load_lock = RLock()
         self._self_path_changed(bool(path))
-        self.reload()
 
     def __getitem__(self, i: int) -> Union[File, "Folder"]:
-        if i < len(self.__subdirectories):
-            sd = self.__subdirectories[i]
-
-            if isinstance(sd, dict):
-                sd = Folder(Path(sd["subdir"]), self, self.__ss)
-                self.__subdirectories[i] = sd
+        self.__ensure_loaded()
+        self.__compact()
 
-            return sd
+        if i < len(self.__subdirectories):
+            return self.__subfolder(i)
 
         return self.__files[i-len(self.__subdirectories)]
 
     def __iter__(self) -> Iterator[Union[File, "Folder"]]:
+        self.__ensure_loaded()
+        self.__compact()
+
         return map(self.__getitem__, range(len(self.__subdirectories)+len(self.__files)))
 
     def __repr__(self) -> str:
+        self.__ensure_loaded()
+        self.__compact()
         dirs = ", ".join(map(
             lambda s: str(s) if isinstance(s, Folder) else str(Path(s["subdir"]).parts[-1]),
             self.__subdirectories))
@@ -57,34 +85,502 @@ class Folder:
     def __str__(self) -> str:
         return self.__path_name
 
-    def __uploader(self, _multi_encoder: MultipartEncoder, _file_size: int, _buffer_size: int, _update_func: Callable[[int], None]):
+    def __send(self, _encoder_func: Callable[[], MultipartEncoder], _resendable: bool, _body_size: int, _buffer_size: int,
+               _report_func: Callable[[int, Union[bytes, memoryview]], None], _body: Optional[Union[bytes, memoryview]] = None) -> Optional[int]:
         url, path = "dashboard.blomp.com", "/dashboard/storage/upload_object"
-        conn = HTTPSConnection(url)
-        conn.putrequest("POST", path)
-
-        for header in self.__ss.headers.items():
-            conn.putheader(*header)
-
-        conn.putheader("Content-Type", _multi_encoder.content_type)
-        conn.putheader("Content-Length", str(_multi_encoder.len))
-        conn.putheader("Cookie", "; ".join(map(lambda ck: "=".join(ck), self.__ss.cookies.get_dict().items())))
-        conn.endheaders()
-
-        conn.send(_multi_encoder.read(_multi_encoder.len - _file_size))
-        data = _multi_encoder.read(_buffer_size)
-        while data:
-            _update_func(len(data))
-            conn.send(data)
-            data = _multi_encoder.read(_buffer_size)
-        
-        try:
-            response = conn.getresponse()
+        encoder = _encoder_func()
+        started = False
+
+        def send(conn: HTTPSConnection) -> Optional[int]:
+            nonlocal encoder, started
+
+            # The request is sent again when a reused connection has been closed by the server
+            if started:
+                if not _resendable:
+                    raise ConnectionResetError("The connection was closed by the server while the upload was sent")
+                encoder = _encoder_func()
+
+            # When the body is given, the file part of the encoder is empty and the body is sent between its preamble and epilogue
+            if _body is None:
+                length = encoder.len
+            else:
+                preamble, epilogue = split_envelope(encoder)
+                length = len(preamble)+len(_body)+len(epilogue)
+
+            conn.putrequest("POST", path)
+
+            for header in self.__ss.headers.items():
+                conn.putheader(*header)
+
+            conn.putheader("Content-Type", encoder.content_type)
+            conn.putheader("Content-Length", str(length))
+            conn.putheader("Cookie", "; ".join(map(lambda ck: "=".join(ck), self.__ss.cookies.get_dict().items())))
+            conn.endheaders()
+            started = True
+
+            if _body is None:
+                # The blocks read from the encoder are reported only where they overlap the file content
+                body_start = encoder.len - _body_size - len(envelope_epilogue(encoder))
+                position = 0
+
+                data = encoder.read(encoder.len - _body_size)
+                while data:
+                    start, end = max(body_start-position, 0), min(body_start+_body_size-position, len(data))
+                    if start < end:
+                        _report_func(position+start-body_start, data[start:end])
+
+                    conn.send(data)
+                    position += len(data)
+                    data = encoder.read(_buffer_size)
+
+            else:
+                conn.send(preamble)
+
+                with memoryview(_body) as body:
+                    for i in range(0, len(body), _buffer_size):
+                        with body[i:i+_buffer_size] as block:
+                            _report_func(i, block)
+                            conn.send(block)
+
+                conn.send(epilogue)
+
+            try:
+                response = conn.getresponse()
+            except ResponseNotReady:
+                conn.close()
+                return None
+
+            # Once the response has started, the request must not be sent again on a new connection
+            try:
+                response.read()
+            except ConnectionError as e:
+                raise IncompleteRead(b"") from e
+
             if response.getheader("Set-Cookie"):
                 self.__ss.cookies.extract_cookies(response, Request("https://"+url+path))
-        except ResponseNotReady:
-            pass
 
-        self.reload()
+            return response.status
+
+        return self.__ss.connection_pool.request(url, send)
+
+    def __post(self, _file_name: str, _index: int, _encoder_func: Callable[[], MultipartEncoder], _body_size: int,
+               _buffer_size: int, _update_func: Callable[[int], None], _body: Optional[Union[bytes, memoryview]] = None,
+               _hasher: Optional["hashlib._Hash"] = None, _resendable: bool = True):
+        policy = self.__ss.retry_policy
+        token = self.__ss.token
+        renewed = False
+        sent = 0
+
+        # Bytes sent again by a retry are not reported or hashed twice
+        def report(offset: int, block: Union[bytes, memoryview]):
+            nonlocal sent
+            end = offset+len(block)
+
+            if end > sent:
+                block = block[max(sent-offset, 0):]
+                _update_func(len(block))
+                if _hasher is not None:
+                    _hasher.update(block)
+                sent = end
+
+        attempt = 0
+        while True:
+            error: Optional[Exception] = None
+
+            try:
+                status = self.__send(_encoder_func, _resendable, _body_size, _buffer_size, report, _body)
+            except (ConnectionError, TimeoutError, HTTPException) as e:
+                error, status = e, None
+            else:
+                if status is not None and 200 <= status < 300:
+                    return
+
+                # Uploads do not go through Session.request, so an expired session is renewed here.
+                # The encoder is built again with the new token.
+                if status in (302, 401, 419) and not renewed and self.__ss.renew(token):
+                    renewed = True
+                    if _resendable:
+                        continue
+
+            retry = error is not None or status is None or (policy is not None and policy.is_retry_status(status))
+            if not _resendable or policy is None or attempt >= policy.retries or not retry:
+                if error is not None:
+                    raise error
+
+                raise ChunkRejectedError(_file_name, _index, status)
+
+            attempt += 1
+            time.sleep(policy.delay(attempt))
+
+    def __uploader(self, _file: Union[pathlib.Path, BinaryIO], _file_name: str, _file_size: int, _chunk_size: Optional[int],
+                   _workers: int, _buffer_size: int, _close: bool, _state: Optional[UploadState], _verify: bool,
+                   _update_func: Callable[[int], None], _buckets: Sequence[TokenBucket]):
+        update = limit_rate(_update_func, _buckets)
+        hasher = hashlib.md5() if _verify else None
+
+        try:
+            if isinstance(_file, pathlib.Path):
+                _file = open(_file, 'rb')
+                _close = True
+
+            mapping = map_file(_file)
+            start, view = 0, None
+
+            try:
+                # Files on disk are sent directly from a memory map, without copying their content into intermediate buffers
+                if mapping is not None:
+                    start = _file.tell()
+                    view = memoryview(mapping)[start:start+_file_size]
+                    _buffer_size = max(_buffer_size, 262144)
+
+                if _chunk_size is not None and _file_size > _chunk_size:
+                    self.__chunked_upload(_file, view, _file_name, _file_size, _chunk_size, _workers, _buffer_size, _state, hasher,
+                                          update, _update_func)
+
+                elif view is not None:
+                    uuid = str(uuid4())
+                    self.__post(_file_name, 0, lambda: self.__encoder(_file_name, io.BytesIO(), _file_size, uuid), _file_size,
+                                _buffer_size, update, view, hasher)
+
+                else:
+                    # A file that cannot be rewound can only be sent once
+                    uuid, position, resendable = str(uuid4()), _file.tell(), _file.seekable()
+
+                    def encoder() -> MultipartEncoder:
+                        if resendable:
+                            _file.seek(position)
+                        return self.__encoder(_file_name, _file, _file_size, uuid)
+
+                    self.__post(_file_name, 0, encoder, _file_size, _buffer_size, update, _hasher=hasher, _resendable=resendable)
+            finally:
+                if mapping is not None:
+                    if view is not None:
+                        view.release()
+                    mapping.close()
+                    _file.seek(start+_file_size)
+        finally:
+            if _close and not isinstance(_file, pathlib.Path):
+                _file.close()
+
+        self.__request_reload()
+
+        if hasher is not None:
+            self.__verify_upload(_file_name, hasher.hexdigest())
+
+    def __verify_upload(self, _file_name: str, _md5_hash: str):
+        # Inside deferred_reload, uploads are verified against the single reload done when the context ends
+        with self.__reload_lock:
+            if self.__deferred_reloads:
+                self.__pending_verifications.append((_file_name, _md5_hash))
+                return
+
+        # A loaded folder has just been reloaded after the upload, so its listing is used
+        self.__load()
+        self.__check_upload(_file_name, _md5_hash)
+
+    def __check_upload(self, _file_name: str, _md5_hash: str):
+        file = self.get_file_by_name(_file_name)
+        if file is None:
+            raise FileNotFoundError("Uploaded file not found")
+
+        if file.md5_hash.lower() != _md5_hash:
+            raise IntegrityError(_file_name, _md5_hash, file.md5_hash)
+
+    def __chunked_upload(self, _file: BinaryIO, _view: Optional[memoryview], _file_name: str, _file_size: int, _chunk_size: int,
+                         _workers: int, _buffer_size: int, _state: Optional[UploadState], _hasher: Optional["hashlib._Hash"],
+                         _update_func: Callable[[int], None], _credit_func: Callable[[int], None]):
+        uuid = str(uuid4()) if _state is None else _state.uuid
+        acknowledged = frozenset() if _state is None else _state.acknowledged
+        chunks = split_range(_file_size, _chunk_size)
+        slots = BoundedSemaphore(_workers)
+
+        # Chunks are read in order, so the file is hashed as it is read
+        def read_chunk(offset: int, size: int) -> Union[bytes, memoryview]:
+            data = _file.read(size) if _view is None else _view[offset:offset+size]
+            if _hasher is not None:
+                _hasher.update(data)
+            return data
+
+        def send_chunk(index: int, offset: int, data: Union[bytes, memoryview]):
+            try:
+                self.__post(_file_name, index, lambda: self.__encoder(_file_name, io.BytesIO(), _file_size, uuid, index, offset,
+                                                                      len(data), _chunk_size, len(chunks)),
+                            len(data), _buffer_size, _update_func, data)
+            finally:
+                if isinstance(data, memoryview):
+                    data.release()
+                slots.release()
+
+            if _state is not None:
+                _state.acknowledge(index)
+
+        def skip_chunk(offset: int, size: int):
+            # Chunks received by the server in a previous attempt are not sent again, but they are still read to be hashed
+            if _hasher is not None:
+                data = read_chunk(offset, size)
+                if isinstance(data, memoryview):
+                    data.release()
+            elif _view is None:
+                _file.seek(size, 1)
+            _credit_func(size)
+
+        # The last chunk is only sent after all the others have been received,
+        # since it is the one that makes the server assemble the file.
+        with ThreadPoolExecutor(_workers) as executor:
+            futures = []
+            for index, (offset, size) in enumerate(chunks[:-1]):
+                if index in acknowledged:
+                    skip_chunk(offset, size)
+                    continue
+
+                slots.acquire()
+                futures.append(executor.submit(send_chunk, index, offset, read_chunk(offset, size)))
+
+            for future in futures:
+                future.result()
+
+        offset, size = chunks[-1]
+
+        if len(chunks)-1 not in acknowledged:
+            slots.acquire()
+
+            try:
+                send_chunk(len(chunks)-1, offset, read_chunk(offset, size))
+            except ChunkRejectedError as e:
+                # The server could not assemble the file, so the upload must be started again.
+                # Other errors may be transient, so the chunks received are kept to resume the upload.
+                policy = self.__ss.retry_policy
+                if _state is not None and e.status is not None and (policy is None or not policy.is_retry_status(e.status)):
+                    _state.discard()
+                raise
+        else:
+            skip_chunk(offset, size)
+
+        if _state is not None:
+            _state.discard()
+
+    def __encoder(self, _file_name: str, _file: BinaryIO, _file_size: int, _uuid: str, _index: int = 0, _offset: int = 0,
+                  _current_size: Optional[int] = None, _chunk_size: Optional[int] = None, _chunk_count: int = 1) -> MultipartEncoder:
+        return dropzone_encoder(_file_name, _file, _file_size, _uuid, self.__path_str, self.__ss.token, self.__ss.client_id,
+                                _index, _offset, _current_size, _chunk_size, _chunk_count)
+
+    @staticmethod
+    def __run_many(_func: Callable[[_T], _R], _items: Iterable[_T], _workers: int) -> Dict[_T, Union[_R, Exception]]:
+        if _workers <= 0:
+            raise ValueError('"workers" must be greater than zero')
+
+        results: Dict[_T, Union[_R, Exception]] = {}
+
+        with ThreadPoolExecutor(_workers) as executor:
+            futures = {executor.submit(_func, item): item for item in dict.fromkeys(_items)}
+
+            for future, item in futures.items():
+                try:
+                    results[item] = future.result()
+                except Exception as e:
+                    results[item] = e
+
+        return results
+
+    def __delete_item(self, _item: Union[File, "Folder", str],
+                      _removed: Optional[List[Union[File, "Folder"]]] = None) -> bool:
+        if isinstance(_item, str):
+            item_ = (self.get_file_by_name(_item) or
+                     self.get_folder_by_name(_item))
+            if item_ is None:
+                raise FileNotFoundError("Item not found")
+
+            _item = item_
+
+        if isinstance(_item, File):
+            r = self.__ss.get("https://dashboard.blomp.com/dashboard/storage/delete_object",
+                              params=dict(path=_item.file_path))
+            self.__ss.invalidate_share_link(_item.file_path)
+
+        else:
+            r = self.__ss.get("https://dashboard.blomp.com/dashboard/storage/delete_folder",
+                              params=dict(folder=_item.__path_str))
+            self.__ss.invalidate_listing(_item.__path_str, True)
+            self.__ss.invalidate_share_link(_item.__path_str, True)
+
+        success = bool(r.json()["response"])
+        if success:
+            if _removed is None:
+                self._item_removed(_item)
+            else:
+                _removed.append(_item)
+
+        return success
+
+    def __paste_item(self, _item: Union[File, "Folder"], _cut: bool) -> bool:
+        is_file = isinstance(_item, File)
+        params = dict(
+            original_path=_item.file_path if is_file else _item.path,
+            action="move" if _cut else "copy",
+            target_path=self.__path_str,
+            file_name=_item.name if is_file else "",
+            type="file" if is_file else "folder"
+        )
+        response = self.__ss.get("https://dashboard.blomp.com/dashboard/file/move", params=params)
+
+        if response.text != "success":
+            return False
+
+        source = Path(params["original_path"]).parent
+        self.__ss.invalidate_listing(source.as_dir(end_sep=bool(source)))
+
+        if is_file:
+            self.__ss.invalidate_share_link(params["original_path"])
+        else:
+            self.__ss.invalidate_share_link(_item.path, True)
+            self.__ss.invalidate_listing(_item.path, True)
+            self.__ss.invalidate_listing((self.__path/_item.name).as_dir(), True)
+
+        return True
+
+    def __iter_records(self, _page_size: Optional[int] = None) -> Iterator[Union[FileData, Subdir]]:
+        marker: Optional[str] = None
+
+        while True:
+            params = dict(prefix=self.__path_str)
+            if _page_size is not None:
+                params["limit"] = str(_page_size)
+                if marker is not None:
+                    params["marker"] = marker
+
+            count = 0
+            with self.__ss.get("https://dashboard.blomp.com/dashboard/folder?prefix", params=params, stream=True) as r:
+                for record in iter_json_array(r.iter_content(65536), "data"):
+                    key: str = record.get("subdir", record.get("name", ""))  # type: ignore
+
+                    # If the marker is ignored by the server, the first page is returned again
+                    if count == 0 and marker is not None and key <= marker:
+                        return
+
+                    count += 1
+                    marker = key
+                    yield record
+
+            # A page with more entries than the limit means that the server does not paginate
+            if _page_size is None or count != _page_size:
+                return
+
+    def _file_renamed(self, file: File, old_name: str):
+        with self.__load_lock:
+            i = self.__file_index.get(old_name)
+
+            if i is not None and self.__files[i] is file:
+                del self.__file_index[old_name]
+                self.__file_index[file.name] = i
+
+    def _item_removed(self, item: Union[File, "Folder"]):
+        """Removes a file or subfolder that was deleted or moved from the loaded contents of this folder"""
+
+        self._items_removed((item,))
+
+    def _items_removed(self, items: Iterable[Union[File, "Folder"]]):
+        """Removes several files or subfolders that were deleted or moved from the loaded contents of this folder.
+
+        The items leave the name indices at once, while the contents are compacted only when they are accessed again.
+        """
+
+        with self.__load_lock:
+            for item in items:
+                if isinstance(item, File):
+                    i = self.__file_index.get(item.name)
+                    if i is None or self.__files[i] is not item:
+                        continue
+
+                    del self.__file_index[item.name]
+                    self.__removed_files.add(i)
+
+                else:
+                    i = self.__folder_index.get(item.__path_name)
+                    sd = None if i is None else self.__subdirectories[i]
+                    if sd is None or (isinstance(sd, Folder) and sd is not item):
+                        continue
+
+                    del self.__folder_index[item.__path_name]
+                    self.__removed_folders.add(i)  # type: ignore
+
+    def __compact(self):
+        # Drops the removed items from the contents, rebuilding the indices once for all of them
+        with self.__load_lock:
+            if self.__removed_files:
+                self.__files = [file for i, file in enumerate(self.__files) if i not in self.__removed_files]
+                self.__removed_files = set()
+                self.__file_index = {}
+                for i, file in enumerate(self.__files):
+                    self.__file_index.setdefault(file.name, i)
+
+            if self.__removed_folders:
+                self.__subdirectories = [sd for i, sd in enumerate(self.__subdirectories)
+                                         if i not in self.__removed_folders]
+                self.__removed_folders = set()
+                self.__folder_index = {}
+                for i, sd in enumerate(self.__subdirectories):
+                    name = sd.__path_name if isinstance(sd, Folder) else Path(sd["subdir"]).parts[-1]
+                    self.__folder_index.setdefault(name, i)
+
+    def __moved_here(self, _items: Iterable[Union[File, "Folder"]]):
+        # The items leave the contents of their old folders, and this folder must be loaded again to include them
+        moved: Dict[int, Tuple[Folder, List[Union[File, Folder]]]] = {}
+
+        for item in _items:
+            if isinstance(item, File):
+                old_parent = item._parent_changed(self)
+            else:
+                old_parent = item.__parent
+                item.__parent = self
+
+            if old_parent is not None:
+                moved.setdefault(id(old_parent), (old_parent, []))[1].append(item)
+
+        for old_parent, items in moved.values():
+            old_parent._items_removed(items)
+
+        with self.__load_lock:
+            self.__loaded = False
+
+    def __request_reload(self):
+        self.__ss.invalidate_listing(self.__path_str)
+
+        with self.__reload_lock:
+            if self.__deferred_reloads:
+                self.__reload_pending = True
+                return
+
+        if self.__loaded:
+            self.reload()
+
+    def __load(self):
+        if not self.__loaded:
+            with self.__load_lock:
+                if not self.__loaded:
+                    self.reload(True)
+
+    def __ensure_loaded(self):
+        self.__load()
+        prefetcher = self.__ss.prefetcher
+
+        if prefetcher is not None and not self.__prefetched:
+            self.__prefetched = True
+            self.__compact()
+
+            for i in range(len(self.__subdirectories)):
+                sd = self.__subfolder(i)
+                if not sd.__loaded:
+                    prefetcher.prefetch(sd.__load)
+
+    def __subfolder(self, i: int) -> "Folder":
+        with self.__load_lock:
+            sd = self.__subdirectories[i]
+
+            if isinstance(sd, dict):
+                sd = Folder(Path(sd["subdir"]), self, self.__ss)
+                self.__subdirectories[i] = sd
+
+            return sd
 
     def _parent_path_changed(self, new_path: Path):
         self.__path = new_path/self.__path_name
@@ -98,6 +594,8 @@ class Folder:
         except IndexError:
             self.__path_name = ""
 
+        self.__compact()
+
         for sd in self.__subdirectories:
             if isinstance(sd, Folder):
                 sd._parent_path_changed(self.__path)
@@ -105,18 +603,21 @@ class Folder:
         for file in self.__files:
             file._parent_path_changed(self.__path)
 
-    @staticmethod
-    def __guess_mime(file_uri: str) -> str:
-        mime = mimetypes.guess_type(file_uri)[0]
-
-        return mime if mime else "application/octet-stream"
-
     @property
     def files(self) -> Tuple[File, ...]:
         """Tuple with all files in this folder"""
 
+        self.__ensure_loaded()
+        self.__compact()
+
         return tuple(self.__files)
 
+    @property
+    def loaded(self) -> bool:
+        """True, if the contents of this folder have already been loaded"""
+
+        return self.__loaded
+
     @property
     def name(self):
         """Name of this folder"""
@@ -139,7 +640,10 @@ class Folder:
     def subfolders(self) -> Tuple["Folder", ...]:
         """Tuple with all subfolders in this folder"""
 
-        return tuple(map(self.__getitem__, range(len(self.__subdirectories)))) # type: ignore
+        self.__ensure_loaded()
+        self.__compact()
+
+        return tuple(map(self.__subfolder, range(len(self.__subdirectories))))
 
     def create_folder(self, name: str):
         """Create a new folder in this directory.
@@ -152,6 +656,56 @@ class Folder:
 
         self.__ss.post("https://dashboard.blomp.com/dashboard/storage/create_folder",
                        data={"_token": self.__ss.token, "pseudo-folder": self.__path_str, "folder_name": name+"/"})
+        self.__ss.invalidate_listing(self.__path_str)
+
+    @contextmanager
+    def deferred_reload(self) -> Iterator["Folder"]:
+        """Context manager that defers the reloads done by this folder after each upload.
+        All reloads requested while the context is active are collapsed into a single one, done when the context ends.
+
+        Yields
+        ------
+        folder : Folder
+            This folder.
+
+        Notes
+        -----
+        Uploads that finish after the context ends reload this folder as usual, so they should be waited for inside the context.
+        Uploads with `verify` enabled are verified when the context ends, raising `IntegrityError` there.
+
+        Examples
+        --------
+        >>> with folder.deferred_reload():
+        ...     threads = [folder.upload(path)[0] for path in paths]
+        ...     for thread in threads:
+        ...         thread.join()
+        """
+
+        with self.__reload_lock:
+            self.__deferred_reloads += 1
+
+        try:
+            yield self
+        finally:
+            with self.__reload_lock:
+                self.__deferred_reloads -= 1
+                reload = self.__reload_pending and not self.__deferred_reloads
+                pending: List[Tuple[str, str]] = []
+
+                if reload:
+                    self.__reload_pending = False
+
+                if not self.__deferred_reloads:
+                    pending, self.__pending_verifications = self.__pending_verifications, []
+
+            if reload and self.__loaded:
+                self.reload()
+
+        if pending:
+            self.__load()
+
+            for file_name, md5_hash in pending:
+                self.__check_upload(file_name, md5_hash)
 
     def delete(self, item: Union[File, "Folder", str]) -> bool:
         """Deletes a folder or file in this directory.
@@ -173,23 +727,36 @@ class Folder:
             Raised if `item` parameter is not found in this folder.
         """
 
-        if isinstance(item, str):
-            item_ = (self.get_file_by_name(item) or
-                     self.get_folder_by_name(item))
-            if item_ is None:
-                raise FileNotFoundError("Item not found")
+        success = self.__delete_item(item)
+        self.__ss.invalidate_listing(self.__path_str)
 
-            item = item_
+        return success
 
-        if isinstance(item, File):
-            r = self.__ss.get("https://dashboard.blomp.com/dashboard/storage/delete_object",
-                              params=dict(path=item.file_path))
+    def delete_many(self, items: Iterable[Union[File, "Folder", str]],
+                    workers: int = 8) -> Dict[Union[File, "Folder", str], Union[bool, Exception]]:
+        """Deletes several folders or files in this directory at the same time. See `delete`.
 
-        else:
-            r = self.__ss.get("https://dashboard.blomp.com/dashboard/storage/delete_folder",
-                              params=dict(folder=item.__path_str))
+        Parameters
+        ----------
+        items : `Iterable[File | Folder | str]`
+            Folders or files belonging to this folder, or their names.
+        workers : `int`, optional
+            Maximum number of items deleted at the same time. (Default: 8)
 
-        return bool(r.json()["response"])
+        Returns
+        -------
+        results : `Dict[File | Folder | str, bool | Exception]`
+            For each item, True, if the server reports that the operation was successful, False otherwise,
+            or the exception raised while deleting it (`FileNotFoundError`, if it is not found in this folder).
+        """
+
+        # The deleted items are removed from the contents at once, after all requests
+        removed: List[Union[File, Folder]] = []
+        results = self.__run_many(lambda item: self.__delete_item(item, removed), items, workers)
+        self._items_removed(removed)
+        self.__ss.invalidate_listing(self.__path_str)
+
+        return results
 
     def get_file_by_name(self, name: str) -> Optional[File]:
         """Finds a file in this folder by name and returns it, if exists.
@@ -206,9 +773,10 @@ class Folder:
             Otherwise, None will be returned.
         """
 
-        for file in self.__files:
-            if file.name == name:
-                return file
+        self.__ensure_loaded()
+        i = self.__file_index.get(name)
+
+        return None if i is None else self.__files[i]
 
     def get_folder_by_name(self, name: str) -> Optional["Folder"]:
         """Finds a subfolder in this folder by name and returns it, if exists.
@@ -225,19 +793,68 @@ class Folder:
             Otherwise, None will be returned.
         """
 
-        for i in range(len(self.__subdirectories)):
-            folder = self.__subdirectories[i]
+        self.__ensure_loaded()
+        i = self.__folder_index.get(name)
 
-            if isinstance(folder, dict):
-                p = Path(folder["subdir"])
-                if p.parts[-1] == name:
-                    folder = Folder(p, self, self.__ss)
-                    self.__subdirectories[i] = folder
-                    return folder
+        return None if i is None else self.__subfolder(i)
 
-            else:
-                if folder.__path_name == name:
-                    return folder
+    def iter_contents(self, page_size: Optional[int] = None) -> Iterator[Union[File, "Folder"]]:
+        """Iterates over the contents of this folder, as its listing is received, without loading them into this folder.
+        The memory used does not depend on the number of items in this folder, so this method is suitable for very large folders.
+
+        Parameters
+        ----------
+        page_size : `int`, optional
+            If specified, the listing is requested in pages with up to this number of items, if the server supports it.
+            (Default: None (the whole listing is requested at once))
+
+        Yields
+        ------
+        item : File or Folder
+            Each file or subfolder in this folder, in the order returned by the server. Subfolders are not loaded.
+
+        Notes
+        -----
+        Files with 100 MiB or more are listed with a directory of the same name, which is skipped when it is listed after the file,
+        as the server does.
+        """
+
+        if page_size is not None and page_size <= 0:
+            raise ValueError('"page_size" must be greater than zero')
+
+        segment_dirs = set()
+
+        for record in self.__iter_records(page_size):
+            if "subdir" in record:
+                path_ = Path(record["subdir"])  # type: ignore
+                if path_.parts[-1] not in segment_dirs:
+                    yield Folder(path_, self, self.__ss)
+
+            elif record["content_type"] != "application/directory":  # type: ignore
+                file = File(self.__path, record, self.__ss, self)  # type: ignore
+                if file.size >= 104857600:
+                    segment_dirs.add(file.name)
+
+                yield file
+
+    def iter_files(self, workers: int = 4, max_depth: Optional[int] = None) -> Iterator[File]:
+        """Iterates over all files in this folder and its subfolders, recursively. See the `walk` method.
+
+        Parameters
+        ----------
+        workers : `int`, optional
+            Maximum number of folder listings requested at the same time. (Default: 4)
+        max_depth : `int`, optional
+            Maximum depth of the subfolders whose files are included, with 0 being only this folder. (Default: None (no limit))
+
+        Yields
+        ------
+        file : File
+            A file in this folder or in one of its subfolders.
+        """
+
+        for _, _, files in self.walk(workers, max_depth):
+            yield from files
 
     def paste(self, file_or_folder: Union[File, "Folder"], cut: bool = False) -> bool:
         """Pastes a file or folder from another directory into this folder
@@ -256,30 +873,74 @@ class Folder:
             True, if the server reports that the operation was successful, or False otherwise.
         """
 
-        ff = file_or_folder
-        is_file = isinstance(ff, File)
-        params = dict(
-            original_path=ff.file_path if is_file else ff.path,
-            action="move" if cut else "copy",
-            target_path=self.__path_str,
-            file_name=ff.name if is_file else "",
-            type="file" if is_file else "folder"
-        )
-        response = self.__ss.get("https://dashboard.blomp.com/dashboard/file/move", params=params)
+        if not self.__paste_item(file_or_folder, cut):
+            return False
+
+        self.__ss.invalidate_listing(self.__path_str)
+        if cut:
+            self.__moved_here((file_or_folder,))
+        file_or_folder._parent_path_changed(self.__path)
+
+        return True
+
+    def paste_many(self, items: Iterable[Union[File, "Folder"]], cut: bool = False,
+                   workers: int = 8) -> Dict[Union[File, "Folder"], Union[bool, Exception]]:
+        """Pastes several files or folders from other directories into this folder at the same time. See `paste`.
+        The paths of the pasted `File` and `Folder` objects are updated after all items have been pasted.
+
+        Parameters
+        ----------
+        items : `Iterable[File | Folder]`
+            `File` or `Folder` objects from other directories to be pasted into this folder.
+        cut : bool, optional
+            If `True`, the items will be cut from their old directories and pasted into this folder.
+            If `False`, the items will be copied to this folder. (Default: False)
+        workers : `int`, optional
+            Maximum number of items pasted at the same time. (Default: 8)
+
+        Returns
+        -------
+        results : `Dict[File | Folder, bool | Exception]`
+            For each item, True, if the server reports that the operation was successful, False otherwise,
+            or the exception raised while pasting it.
+        """
+
+        results = self.__run_many(lambda ff: self.__paste_item(ff, cut), items, workers)
+        self.__ss.invalidate_listing(self.__path_str)
 
-        if response.text == "success":
+        pasted = [ff for ff, result in results.items() if result is True]
+        if cut:
+            self.__moved_here(pasted)
+
+        for ff in pasted:
             ff._parent_path_changed(self.__path)
-            return True
 
-        return False
+        return results
+
+    def reload(self, use_cache: bool = False):
+        """This method updates the data in this folder. It should only be called when there are changes to this folder.
+
+        Parameters
+        ----------
+        use_cache : `bool`, optional
+            If True, and the session has a listing cache with a valid listing of this folder, this listing is used instead of requesting it.
+            Otherwise, the listing is requested and stored in the cache, if any. (Default: False)
+        """
+
+        cache = self.__ss.listing_cache
+        folder_data: Optional[List[Union[FileData, Subdir]]] = None
+
+        if use_cache and cache is not None:
+            folder_data = cache.get(self.__ss.client_id, self.__path_str)
 
-    def reload(self):
-        """This method updates the data in this folder. It should only be called when there are changes to this folder."""
+        if folder_data is None:
+            folder_data = list(self.__iter_records())
+
+            if cache is not None:
+                cache.put(self.__ss.client_id, self.__path_str, folder_data)
 
-        folder_data: List[Union[FileData, Subdir]] = self.__ss.get("https://dashboard.blomp.com/dashboard/folder?prefix",
-                                                             params=dict(prefix=self.__path_str)).json()["data"]
         subdirectories: List[Subdir] = []
-        self.__files.clear()
+        files: List[File] = []
 
         for fd in folder_data:
             if "subdir" in fd:
@@ -287,17 +948,33 @@ class Folder:
                 continue
 
             if fd["content_type"] != "application/directory":
-                self.__files.append(File(self.__path, fd, self.__ss))
-
-        for file in self.__files:
-            if file.size >= 104857600:
-                for sd in subdirectories:
-                    sd_name = Path(sd["subdir"]).parts[-1]
-                    if file.name == sd_name:
-                        subdirectories.remove(sd)
-
-        self.__subdirectories.clear()
-        self.__subdirectories.extend(subdirectories)
+                files.append(File(self.__path, fd, self.__ss, self))
+
+        file_index: Dict[str, int] = {}
+        for i, file in enumerate(files):
+            file_index.setdefault(file.name, i)
+
+        # Files with 100 MiB or more are listed with a directory of the same name, which holds their segments
+        segment_dirs = {file.name for file in files if file.size >= 104857600}
+        subdir_names = [Path(sd["subdir"]).parts[-1] for sd in subdirectories]
+
+        if segment_dirs.intersection(subdir_names):
+            subdirectories = [sd for sd, name in zip(subdirectories, subdir_names) if name not in segment_dirs]
+            subdir_names = [name for name in subdir_names if name not in segment_dirs]
+
+        folder_index: Dict[str, int] = {}
+        for i, name in enumerate(subdir_names):
+            folder_index.setdefault(name, i)
+
+        with self.__load_lock:
+            self.__files = files
+            self.__file_index = file_index
+            self.__subdirectories = subdirectories  # type: ignore
+            self.__folder_index = folder_index
+            self.__removed_files = set()
+            self.__removed_folders = set()
+            self.__loaded = True
+            self.__prefetched = False
 
     def rename(self, new_name: str) -> bool:
         """Renames this folder. This method **is unsafe**. Use the `safe_rename` method instead.
@@ -331,24 +1008,43 @@ class Folder:
 
         success = r.text == "success"
         if success:
-            self.__path = self.__path.parent/new_name
+            parent = self.__path.parent
+            self.__ss.invalidate_listing(parent.as_dir(end_sep=bool(parent)))
+            self.__ss.invalidate_listing(self.__path_str, True)
+
+            if self.__parent is not None:
+                with self.__parent.__load_lock:
+                    i = self.__parent.__folder_index.pop(self.__path_name, None)
+                    if i is not None:
+                        self.__parent.__folder_index[new_name] = i
+
+            self.__path = parent/new_name
             self._self_path_changed()
 
         return success
 
-    def safe_rename(self, new_name: str):
+    def safe_rename(self, new_name: str, workers: int = 8):
         """Renames this folder. Use this method instead of `rename` method.
 
         Parameters
         ----------
         new_name : `str`
             New name for this folder.
+        workers : `int`, optional
+            Maximum number of files and folders moved at the same time. (Default: 8)
+
+        Raises
+        ------
+        ConnectionError
+            Raised if some files or folders could not be moved. In this case, this folder is not deleted
+            and keeps the items that were not moved.
 
         Notes
         -----
         This method creates a new folder with the name specified in the `new_name` parameter in the parent directory of this folder.
         After that, all files and folders in this directory are cut and pasted into the new folder, and then this now empty folder is deleted.
-        This process may take a while, depending on the number of files present in this folder, but it is much safer than the `rename` method, which renames the folder directly.
+        Several items are moved at the same time, but this process may take a while, depending on the number of files
+        present in this folder. Even so, it is much safer than the `rename` method, which renames the folder directly.
         Apparently, when directly renaming a folder, the Blomp Cloud does the same process described here, but incompletely in some cases, which makes the `rename` method unsafe.
         """
 
@@ -359,14 +1055,78 @@ class Folder:
         self.__parent.reload()
         new_folder: Folder = self.__parent.get_folder_by_name(new_name)  # type: ignore
 
-        for ff in self:
-            new_folder.paste(ff, True)
+        # The paths of the moved items are updated at once, when the path of this folder changes
+        results = new_folder.__run_many(lambda ff: new_folder.__paste_item(ff, True), self, workers)
+        self.__ss.invalidate_listing(new_folder.__path_str)
+        failed = [ff.name for ff, result in results.items() if result is not True]
+
+        if failed:
+            moved = [ff for ff, result in results.items() if result is True]
+            new_folder.__moved_here(moved)
+
+            for ff in moved:
+                ff._parent_path_changed(new_folder.__path)
+
+            self.reload()
+            raise ConnectionError(f"{len(failed)} of {len(results)} items could not be moved to {new_folder.path}: {', '.join(failed)}")
 
         self.__parent.delete(self)
         self.__path = new_folder.__path
         self._self_path_changed()
 
-    def upload(self, file: Union[str, pathlib.Path, BinaryIO], file_name: Optional[str] = None, replace_if_exists: bool = False, buffer_size: int = 8192) -> Tuple[Thread, Monitor]:
+    def share_many(self, files: Optional[Iterable[File]] = None, emails: Optional[Iterable[str]] = None,
+                   anyone_can_view: bool = False, workers: int = 8) -> Dict[File, Union[str, Exception]]:
+        """Enables the sharing feature for several files at the same time. See `File.share`.
+        The share information of each file is kept in the session, so sharing a file again makes no request to get it.
+
+        Parameters
+        ----------
+        files : `Iterable[File]`, optional
+            Files to be shared. They do not need to belong to this folder. (Default: None (the files in this folder))
+        emails : `Iterable[str]`, optional
+            Emails that will receive the shared file links. (Default: None (The links will not be sent to any email))
+        anyone_can_view : `bool`, optional
+            If True, anyone on the internet can see the files. (Default: False)
+        workers : `int`, optional
+            Maximum number of files shared at the same time. (Default: 8)
+
+        Returns
+        -------
+        results : `Dict[File, str | Exception]`
+            Shared link of each file, or the exception raised while sharing it.
+        """
+
+        # Every file is shared with the same e-mails, even if they are given by a one-shot iterator
+        emails = None if emails is None else list(emails)
+        return self.__run_many(lambda f: f.share(emails, anyone_can_view), self.files if files is None else files, workers)
+
+    def share_switch_many(self, status: bool, files: Optional[Iterable[File]] = None,
+                          workers: int = 8) -> Dict[File, Union[bool, Exception]]:
+        """Enables or disables sharing of several files at the same time. See `File.share_switch_on` and `File.share_switch_off`.
+        Unlike these methods, files that already have the given sharing status are not an error.
+
+        Parameters
+        ----------
+        status : `bool`
+            If True, sharing is enabled. Otherwise, it is disabled.
+        files : `Iterable[File]`, optional
+            Files whose sharing will be changed. They do not need to belong to this folder. (Default: None (the files in this folder))
+        workers : `int`, optional
+            Maximum number of files changed at the same time. (Default: 8)
+
+        Returns
+        -------
+        results : `Dict[File, bool | Exception]`
+            For each file, True, if the server reports that the operation was successful, False otherwise,
+            or the exception raised while changing it.
+        """
+
+        return self.__run_many(lambda f: f._share_switch(status), self.files if files is None else files, workers)
+
+    def upload(self, file: Union[str, pathlib.Path, BinaryIO], file_name: Optional[str] = None, replace_if_exists: bool = False, buffer_size: int = 8192,
+               chunk_size: Optional[int] = None, workers: int = 4, manager: Optional[TransferManager] = None,
+               priority: int = 0, resume: Union[bool, str, pathlib.Path] = False,
+               verify: bool = False) -> Tuple[Union[Thread, TransferFuture], Monitor]:
         """Upload a file to this folder
 
         Parameters
@@ -387,24 +1147,68 @@ class Folder:
             If False, `FileExistsError` is raised. (Default: False)
         buffer_size : int, optional
             Size, in bytes, of the content uploaded in each iteration. (Default: 8192)
+            Regular files on disk are sent directly from a memory map, in blocks of at least 256 KiB.
+        chunk_size : int, optional
+            If specified, and the file is larger than this value, the file will be split into chunks of `chunk_size` bytes,
+            each one sent in a separate request. Otherwise, the whole file is sent in a single request. (Default: None)
+        workers : int, optional
+            Maximum number of chunks sent at the same time, each one over its own connection.
+            Only considered when the file is uploaded in chunks. (Default: 4)
+        manager : TransferManager, optional
+            If specified, the upload is submitted to this manager instead of running in a new thread.
+            In this case, if `file` is a path, it is only opened when the upload starts. (Default: None)
+        priority : `int`, optional
+            Priority of the upload in the manager. Only considered when `manager` is specified. (Default: 0)
+        resume : `bool` or `str` or `pathlib.Path`, optional
+            If True or a directory, the upload `dzUuid` and the chunks received by the server are saved in a state file in this
+            directory (or in `~/.cache/blomp_api/uploads`, if True), identified by the path, size and modification time of the file
+            and by its destination. If a previous upload of the same file to the same destination was interrupted,
+            only the chunks still missing are sent. Requires `file` to be a path and `chunk_size` to be specified. (Default: False)
+        verify : `bool`, optional
+            If True, the MD5 hash of the content is computed while it is uploaded and compared with the hash reported by the server
+            for the uploaded file in the folder listing, raising `IntegrityError` in the upload if they do not match.
+            Inside `deferred_reload`, the upload is verified when the context ends. (Default: False)
 
         Returns
         -------
-        upload_thread : `threading.Thread`
-            A function thread responsible for uploading the file.
+        upload_thread : `threading.Thread` or TransferFuture
+            A function thread responsible for uploading the file, or a future, if `manager` is specified.
         upload_monitor : UploadMonitor
             An object that can be used to monitor upload progress.
 
         Raises
         ------
         ValueError
-            Raised when the file name or size cannot be automatically determined if the `file_name` parameter are not specified.
+            Raised when the file name or size cannot be automatically determined if the `file_name` parameter are not specified,
+            or when `chunk_size` or `workers` are not positive, or when `resume` is specified without a path and `chunk_size`.
         FileExistsError
             Raised when a file with the same name already exists in this directory, and the `replace_if_exists` parameter is False.
         """
 
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError('"chunk_size" must be greater than zero')
+
+        if workers <= 0:
+            raise ValueError('"workers" must be greater than zero')
+
+        state = None
+        if resume is not False:
+            if not isinstance(file, (str, pathlib.Path)) or chunk_size is None:
+                raise ValueError('"resume" requires "file" to be a path and "chunk_size" to be specified')
+
+            source = pathlib.Path(file).resolve()
+            stat = source.stat()
+            key = dict(path=str(source), size=stat.st_size, mtime=stat.st_mtime_ns, client_id=self.__ss.client_id,
+                       folder=self.__path_str, name=file_name or pathlib.Path(file).name, chunk_size=chunk_size)
+            state = UploadState(default_state_directory() if resume is True else resume, key)
+
+        close = False
         if isinstance(file, (str, pathlib.Path)):
-            file = open(file, 'rb')
+            if manager is None:
+                file = open(file, 'rb')
+                close = True
+            else:
+                file = pathlib.Path(file)
 
         if not file_name:
             if not hasattr(file, "name"):
@@ -412,45 +1216,71 @@ class Folder:
 
             file_name = pathlib.Path(file.name).parts[-1]  # type: ignore
 
-        file_size = total_len(file)
-
-        if not file_size:
-            if file.seekable():
-                s = file.seek(0, 1)
-                file_size = file.seek(0, 2)
-                file.seek(s)
-        
-            else:
-                raise ValueError('Unable to determine file size')
+        file_size = file.stat().st_size if isinstance(file, pathlib.Path) else get_file_size(file)
 
         if not replace_if_exists:
-            for f in self.__files:
-                if f.name == file_name:
-                    raise FileExistsError('A file with same was found. Set the "replace_if_exists" parameter to True to replace the old file or set "file_name" parameter')
+            self.__load()
+
+            if file_name in self.__file_index:
+                raise FileExistsError('A file with same was found. Set the "replace_if_exists" parameter to True to replace the old file or set "file_name" parameter')
+
+        limiters = (self.__ss.bandwidth_limiter, manager.bandwidth_limiter if manager is not None else None)
+        buckets = [limiter.upload for limiter in limiters if limiter is not None]
 
-        boundary = str(uuid4())
         monitor = UploadMonitor(file_size)
+        handle = start_transfer(self.__uploader, (file, file_name, file_size, chunk_size, workers, buffer_size, close, state, verify,
+                                                  monitor._update, buckets),
+                                monitor, manager, priority)
+
+        return handle, monitor
+
+    def walk(self, workers: int = 4, max_depth: Optional[int] = None) -> Iterator[Tuple["Folder", Tuple["Folder", ...], Tuple[File, ...]]]:
+        """Walks through this folder and its subfolders, recursively, in breadth-first order.
+        The listings of several folders are requested at the same time, and each folder is yielded as soon as its listing arrives.
+
+        Parameters
+        ----------
+        workers : `int`, optional
+            Maximum number of folder listings requested at the same time. (Default: 4)
+        max_depth : `int`, optional
+            Maximum depth of the yielded subfolders, with 0 being only this folder. (Default: None (no limit))
+
+        Yields
+        ------
+        folder : Folder
+            This folder or one of its subfolders.
+        subfolders : `Tuple[Folder, ...]`
+            Subfolders of `folder`.
+        files : `Tuple[File, ...]`
+            Files in `folder`.
+
+        Examples
+        --------
+        >>> for folder, subfolders, files in root.walk(workers=8):
+        ...     print(folder.path, len(files))
+        """
+
+        if workers <= 0:
+            raise ValueError('"workers" must be greater than zero')
+
+        with ThreadPoolExecutor(workers) as executor:
+            pending = {executor.submit(self.__load): (self, 0)}
+
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        folder, depth = pending.pop(future)
+                        future.result()
+                        folder.__compact()
+
+                        subfolders = tuple(map(folder.__subfolder, range(len(folder.__subdirectories))))
+                        yield folder, subfolders, tuple(folder.__files)
 
-        me = MultipartEncoder({
-            "dzUuid": boundary,
-            "dzChunkIndex": "0",
-            "dzTotalFileSize": str(file_size),
-            "dzCurrentChunkSize": str(file_size),
-            "dzTotalChunkCount": "1",
-            "dzChunkByteOffset": "0",
-            "dzChunkSize": str(file_size+1),
-            "dzFilename": file_name,
-
-            "folder": self.__path_str,
-            "sub_folder": "",
-            "_token": self.__ss.token,
-            "client-id": str(self.__ss.client_id),
-            "pseudo-folder": self.__path_str,
-            "myfile": (file_name, file, self.__guess_mime(file_name))
-        }, boundary)
-
-        thread = Thread(target=self.__uploader, args=[
-                        me, file_size, buffer_size, monitor._update])
-        thread.start()
-
-        return thread, monitor
+                        if max_depth is None or depth < max_depth:
+                            for sf in subfolders:
+                                pending[executor.submit(sf.__load)] = (sf, depth+1)
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,169 @@
+from contextlib import contextmanager
+from http.client import HTTPSConnection
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+import select
+
+_T = TypeVar("_T")
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTPS connections
+
+    Parameters
+    ----------
+    maxsize : `int`, optional
+        Maximum number of connections open at the same time to each host. (Default: 10)
+    timeout : `float`, optional
+        Timeout, in seconds, of the blocking operations of new connections. If None, there is no timeout. (Default: None)
+    """
+
+    def __init__(self, maxsize: int = 10, timeout: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("Pool size must be greater than zero")
+
+        self.__maxsize = maxsize
+        self.__timeout = timeout
+        self.__lock = Lock()
+        self.__idle: Dict[str, List[HTTPSConnection]] = {}
+        self.__slots: Dict[str, BoundedSemaphore] = {}
+
+    def __repr__(self) -> str:
+        return f"ConnectionPool(maxsize={self.__maxsize})"
+
+    @staticmethod
+    def __is_dropped(conn: HTTPSConnection) -> bool:
+        # An idle connection must not have anything to be read.
+        # If it is readable, then the server has closed it.
+        if conn.sock is None:
+            return True
+
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def __acquire(self, host: str, fresh: bool = False) -> HTTPSConnection:
+        with self.__lock:
+            slots = self.__slots.setdefault(host, BoundedSemaphore(self.__maxsize))
+
+        slots.acquire()
+
+        with self.__lock:
+            idle = self.__idle.setdefault(host, [])
+            while idle and not fresh:
+                conn = idle.pop()
+                if not self.__is_dropped(conn):
+                    return conn
+
+                conn.close()
+
+        if self.__timeout is None:
+            return HTTPSConnection(host)
+
+        return HTTPSConnection(host, timeout=self.__timeout)
+
+    def __release(self, host: str, conn: HTTPSConnection, reuse: bool):
+        if reuse and conn.sock is not None:
+            with self.__lock:
+                self.__idle[host].append(conn)
+        else:
+            conn.close()
+
+        self.__slots[host].release()
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of connections open at the same time to each host"""
+
+        return self.__maxsize
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Timeout, in seconds, of the blocking operations of new connections, or None, if there is no timeout"""
+
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]):
+        self.__timeout = timeout
+
+    @contextmanager
+    def connection(self, host: str) -> Iterator[HTTPSConnection]:
+        """Gets a connection to a host, waiting if the maximum number of connections to this host has been reached.
+        When the context ends, the connection is returned to the pool, or closed if an error has occurred.
+
+        The response to the request made with the connection must be fully read before the context ends.
+
+        Parameters
+        ----------
+        host : `str`
+            Host to connect.
+
+        Yields
+        ------
+        connection : `http.client.HTTPSConnection`
+            A connection to the host.
+        """
+
+        conn = self.__acquire(host)
+        reuse = False
+
+        try:
+            yield conn
+            reuse = True
+        finally:
+            self.__release(host, conn, reuse)
+
+    def request(self, host: str, send: Callable[[HTTPSConnection], _T]) -> _T:
+        """Makes a request with a connection to a host, like `connection`.
+
+        The server may close an idle connection right after it is checked. In that case, if the connection fails before
+        the response arrives, the request is made again, once, with a new connection.
+
+        Parameters
+        ----------
+        host : `str`
+            Host to connect.
+        send : `Callable[[http.client.HTTPSConnection], T]`
+            Function that makes the request with the connection and fully reads its response. It may be called twice,
+            so it must be able to send the request again.
+
+        Returns
+        -------
+        result : `T`
+            Value returned by `send`.
+        """
+
+        fresh = False
+
+        while True:
+            conn = self.__acquire(host, fresh)
+            reused = conn.sock is not None
+            reuse = False
+
+            try:
+                result = send(conn)
+                reuse = True
+                return result
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                if not reused:
+                    raise
+            finally:
+                self.__release(host, conn, reuse)
+
+            fresh = True
+
+    def close(self):
+        """Closes all idle connections"""
+
+        with self.__lock:
+            for idle in self.__idle.values():
+                for conn in idle:
+                    conn.close()
+
+                idle.clear()
+
+
+__all__ = ["ConnectionPool"]
@@ -0,0 +1,142 @@
+from requests_toolbelt import MultipartEncoder
+from requests_toolbelt.multipart.encoder import total_len
+from typing import BinaryIO, Optional, Tuple
+
+import io
+import mimetypes
+import mmap
+import os
+import stat
+
+
+def guess_mime(file_uri: str) -> str:
+    """Guesses the mime type of a file by its name, or returns "application/octet-stream" if it cannot be guessed"""
+
+    mime = mimetypes.guess_type(file_uri)[0]
+
+    return mime if mime else "application/octet-stream"
+
+
+def get_file_size(file: BinaryIO) -> int:
+    """Gets the size of the remaining content of a file-like object.
+
+    Raises
+    ------
+    ValueError
+        Raised when the size cannot be determined.
+    """
+
+    if file.seekable():
+        s = file.seek(0, 1)
+        file_size = file.seek(0, 2)-s
+        file.seek(s)
+
+        return file_size
+
+    file_size = total_len(file)
+
+    if not file_size:
+        raise ValueError('Unable to determine file size')
+
+    return file_size
+
+
+def map_file(file: BinaryIO) -> Optional[mmap.mmap]:
+    """Maps a regular file on disk into memory, for reading.
+
+    Returns
+    -------
+    mapping : `mmap.mmap` or None
+        The memory map of the whole file, or None if the file-like object is not a non-empty regular file on disk.
+    """
+
+    try:
+        fd = file.fileno()
+        st = os.fstat(fd)
+
+        if not stat.S_ISREG(st.st_mode) or not st.st_size:
+            return None
+
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
+def split_envelope(encoder: MultipartEncoder) -> Tuple[bytes, bytes]:
+    """Splits the body of a multipart encoder whose last part (the file) is empty into the content sent before and after the file content.
+
+    Returns
+    -------
+    preamble : `bytes`
+        Content sent before the file content.
+    epilogue : `bytes`
+        Content sent after the file content.
+    """
+
+    envelope = encoder.to_string()
+    epilogue = envelope_epilogue(encoder)
+
+    return envelope[:-len(epilogue)], epilogue
+
+
+def envelope_epilogue(encoder: MultipartEncoder) -> bytes:
+    """Returns the content sent after the last part (the file) of a multipart encoder"""
+
+    return f"\r\n--{encoder.boundary_value}--\r\n".encode()
+
+
+def dropzone_encoder(file_name: str, file: BinaryIO, file_size: int, uuid: str, folder: str, token: str, client_id: int,
+                     index: int = 0, offset: int = 0, current_size: Optional[int] = None, chunk_size: Optional[int] = None,
+                     chunk_count: int = 1) -> MultipartEncoder:
+    """Builds the multipart body of an upload request, in the format sent by the Dropzone uploader of the Blomp dashboard.
+
+    Parameters
+    ----------
+    file_name : `str`
+        Name of the uploaded file.
+    file : file-like object
+        Content of this request (the whole file, or only a chunk of it).
+    file_size : `int`
+        Total size of the uploaded file.
+    uuid : `str`
+        Identifier of the upload, shared by all chunks of the same file.
+    folder : `str`
+        Destination folder path, as a directory.
+    token : `str`
+        CSRF token of the session.
+    client_id : `int`
+        Client ID of the session.
+    index : `int`, optional
+        Index of the chunk. (Default: 0)
+    offset : `int`, optional
+        Offset of the chunk in the file. (Default: 0)
+    current_size : `int`, optional
+        Size of the chunk. (Default: None (the whole file))
+    chunk_size : `int`, optional
+        Size of every chunk, except maybe the last one. (Default: None (the whole file))
+    chunk_count : `int`, optional
+        Total number of chunks. (Default: 1)
+
+    Returns
+    -------
+    encoder : `MultipartEncoder`
+        The request body.
+    """
+
+    return MultipartEncoder({
+        "dzUuid": uuid,
+        "dzChunkIndex": str(index),
+        "dzTotalFileSize": str(file_size),
+        "dzCurrentChunkSize": str(file_size if current_size is None else current_size),
+        "dzTotalChunkCount": str(chunk_count),
+        "dzChunkByteOffset": str(offset),
+        "dzChunkSize": str(file_size+1 if chunk_size is None else chunk_size),
+        "dzFilename": file_name,
+
+        "folder": folder,
+        "sub_folder": "",
+        "_token": token,
+        "client-id": str(client_id),
+        "pseudo-folder": folder,
+        "myfile": (file_name, file, guess_mime(file_name))
+    }, uuid)
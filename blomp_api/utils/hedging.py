@@ -0,0 +1,113 @@
+from collections import deque
+from threading import Lock
+from typing import Deque, Iterable
+from urllib.parse import urlsplit
+
+
+# Endpoints whose requests are cheap to duplicate: small idempotent reads
+HEDGED_PATHS = frozenset({
+    "/dashboard/folder",
+    "/dashboard/file/share/link",
+})
+
+
+class HedgingPolicy:
+    """Rules to send a duplicate of a slow read request, using the response that arrives first.
+
+    The duplicate is sent when the first request has not been answered after the `percentile` of the latencies of the
+    previous requests, limited between `min_delay` and `max_delay`. The number of duplicates is limited to a fraction
+    `budget` of the requests, so that a slow server does not receive twice the load.
+
+    Parameters
+    ----------
+    percentile : `float`, optional
+        Percentile, between 0 and 100, of the observed latencies used as the delay of the duplicate request. (Default: 95.0)
+    min_delay : `float`, optional
+        Minimum delay, in seconds, of the duplicate request. (Default: 0.05)
+    max_delay : `float`, optional
+        Maximum delay, in seconds, of the duplicate request. It is also the delay while few latencies have been observed.
+        (Default: 2.0)
+    budget : `float`, optional
+        Maximum fraction of the requests that can be duplicated. (Default: 0.1)
+    window : `int`, optional
+        Number of the most recent latencies considered. (Default: 200)
+    paths : `Iterable[str]`, optional
+        URL paths of the GET requests that can be duplicated. (Default: HEDGED_PATHS)
+    """
+
+    __MIN_SAMPLES = 20
+    __MAX_TOKENS = 10.0
+
+    def __init__(self, percentile: float = 95.0, min_delay: float = 0.05, max_delay: float = 2.0, budget: float = 0.1,
+                 window: int = 200, paths: Iterable[str] = HEDGED_PATHS):
+        if not 0 <= percentile <= 100:
+            raise ValueError('"percentile" must be between 0 and 100')
+
+        if not 0 <= budget <= 1:
+            raise ValueError('"budget" must be between 0 and 1')
+
+        self.__percentile = percentile
+        self.__min_delay = min_delay
+        self.__max_delay = max_delay
+        self.__budget = budget
+        self.__paths = frozenset(paths)
+        self.__lock = Lock()
+        self.__latencies: Deque[float] = deque(maxlen=window)
+        self.__tokens = 1.0
+        self.__requests = 0
+        self.__hedges = 0
+
+    def __repr__(self) -> str:
+        return f"HedgingPolicy(percentile={self.__percentile}, budget={self.__budget}, hedges={self.__hedges}/{self.__requests})"
+
+    @property
+    def hedges(self) -> int:
+        """Number of duplicate requests sent"""
+
+        return self.__hedges
+
+    @property
+    def requests(self) -> int:
+        """Number of requests eligible for duplication"""
+
+        return self.__requests
+
+    def applies_to(self, method: str, url: str) -> bool:
+        """Returns True, if a request can be duplicated"""
+
+        return method.upper() == "GET" and urlsplit(url).path.rstrip("/") in self.__paths
+
+    def delay(self) -> float:
+        """Returns the time, in seconds, to wait for the first request before sending a duplicate. It counts a new request."""
+
+        with self.__lock:
+            self.__requests += 1
+            self.__tokens = min(self.__tokens+self.__budget, self.__MAX_TOKENS)
+
+            if len(self.__latencies) < self.__MIN_SAMPLES:
+                return self.__max_delay
+
+            latencies = sorted(self.__latencies)
+
+        delay = latencies[round(self.__percentile/100*(len(latencies)-1))]
+        return min(max(delay, self.__min_delay), self.__max_delay)
+
+    def acquire(self) -> bool:
+        """Takes a duplicate request from the budget. Returns False, if the budget is exhausted."""
+
+        with self.__lock:
+            if self.__tokens < 1:
+                return False
+
+            self.__tokens -= 1
+            self.__hedges += 1
+            return True
+
+    def record(self, latency: float):
+        """Records the latency, in seconds, of a request"""
+
+        with self.__lock:
+            self.__latencies.append(latency)
+
+
+__all__ = ["HEDGED_PATHS", "HedgingPolicy"]
@@ -0,0 +1,87 @@
+from threading import Lock
+from typing import Callable, Dict, Optional, Union
+
+import hashlib
+
+
+class OrderedHasher:
+    """Computes the MD5 hash of content written in byte ranges that may arrive in any order, such as in segmented downloads.
+
+    Data written at the current end of the hashed content is hashed at once. Ranges written ahead of it are hashed
+    when the gap before them is filled, by reading them back with `read_func`, usually from the page cache.
+
+    Parameters
+    ----------
+    read_func : `Callable[[int, int], bytes]`, optional
+        Function that reads `size` bytes at `offset` of the written content. Required if ranges are written out of order.
+        (Default: None)
+    """
+
+    __READ_SIZE = 1 << 20
+
+    def __init__(self, read_func: Optional[Callable[[int, int], bytes]] = None):
+        self.__read_func = read_func
+        self.__lock = Lock()
+        self.__md5 = hashlib.md5()
+        self.__position = 0
+        self.__pending: Dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        return f"OrderedHasher(position={self.__position}, pending={len(self.__pending)})"
+
+    @property
+    def position(self) -> int:
+        """Size of the content hashed so far"""
+
+        return self.__position
+
+    def update(self, offset: int, data: Union[bytes, memoryview]):
+        """Hashes `data`, written at `offset` of the content"""
+
+        with self.__lock:
+            if offset == self.__position:
+                self.__md5.update(data)
+                self.__position += len(data)
+                self.__drain()
+            else:
+                self.__pending[offset] = offset+len(data)
+
+    def written(self, offset: int, size: int):
+        """Records that `size` bytes were written at `offset` without passing through this hasher, as in resumed downloads"""
+
+        with self.__lock:
+            if size > 0:
+                self.__pending[offset] = offset+size
+                self.__drain()
+
+    def __drain(self):
+        while self.__position in self.__pending:
+            end = self.__pending.pop(self.__position)
+
+            if self.__read_func is None:
+                raise RuntimeError("Ranges written out of order cannot be hashed without a read function")
+
+            while self.__position < end:
+                data = self.__read_func(self.__position, min(self.__READ_SIZE, end-self.__position))
+                if not data:
+                    raise IOError("Unable to read back the written content")
+
+                self.__md5.update(data)
+                self.__position += len(data)
+
+    def hexdigest(self) -> str:
+        """Returns the MD5 hash of the content hashed so far"""
+
+        with self.__lock:
+            return self.__md5.hexdigest()
+
+    def reset(self):
+        """Discards the hashed content, when the content has to be written from the beginning"""
+
+        with self.__lock:
+            self.__md5 = hashlib.md5()
+            self.__position = 0
+            self.__pending.clear()
+
+
+__all__ = ["OrderedHasher"]
@@ -0,0 +1,76 @@
+from typing import Any, Iterable, Iterator
+
+import codecs
+import json
+import re
+
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[\s,]*")
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Parses the items of an array in a JSON object incrementally, while the JSON content is being received.
+
+    Parameters
+    ----------
+    chunks : `Iterable[bytes]`
+        Parts of the JSON content, encoded in UTF-8, in order.
+    key : `str`
+        Key of the array in the JSON object. The first occurrence of this key is used.
+
+    Yields
+    ------
+    item : `Any`
+        Each item of the array, as soon as it is complete.
+
+    Raises
+    ------
+    ValueError
+        Raised if the content ends before the end of the array, or if the array is not found.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    start = re.compile(r'"'+re.escape(key)+r'"\s*:\s*\[')
+    chunks = iter(chunks)
+    buffer = ""
+    found = False
+
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        match = start.search(buffer)
+
+        if match:
+            buffer = buffer[match.end():]
+            found = True
+            break
+
+        # Keeps the end of the buffer, where the key may be incomplete
+        buffer = buffer[-(len(key)+64):]
+
+    if not found:
+        raise ValueError(f'Array "{key}" not found')
+
+    pos = 0
+    while True:
+        pos = _whitespace.match(buffer, pos).end()  # type: ignore
+
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except ValueError:
+                pass
+            else:
+                yield item
+                pos = end
+                continue
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("Incomplete JSON content")
+
+        buffer = buffer[pos:]+decoder.decode(chunk)
+        pos = 0
@@ -0,0 +1,125 @@
+from ..response_types import FileData, Subdir
+
+from threading import Lock
+from typing import List, Optional, Union
+
+import json
+import sqlite3
+import time
+
+
+class ListingCache:
+    """Persistent cache of folder listings, stored in a SQLite database.
+
+    Parameters
+    ----------
+    database : `str`, optional
+        Path to the database file. If it does not exist, it will be created. (Default: ":memory:" (not persistent))
+    ttl : `float`, optional
+        Time, in seconds, for which a cached listing is considered valid. (Default: 300)
+    """
+
+    def __init__(self, database: str = ":memory:", ttl: float = 300):
+        self.__ttl = ttl
+        self.__lock = Lock()
+        self.__conn = sqlite3.connect(database, check_same_thread=False)
+
+        with self.__lock, self.__conn:
+            self.__conn.execute("CREATE TABLE IF NOT EXISTS listings ("
+                                "client_id INTEGER NOT NULL, prefix TEXT NOT NULL, fetched_at REAL NOT NULL, data TEXT NOT NULL, "
+                                "PRIMARY KEY (client_id, prefix))")
+
+    def __repr__(self) -> str:
+        return f"ListingCache(ttl={self.__ttl})"
+
+    @property
+    def ttl(self) -> float:
+        """Time, in seconds, for which a cached listing is considered valid"""
+
+        return self.__ttl
+
+    @ttl.setter
+    def ttl(self, ttl: float):
+        self.__ttl = ttl
+
+    def get(self, client_id: int, prefix: str) -> Optional[List[Union[FileData, Subdir]]]:
+        """Gets a cached folder listing.
+
+        Parameters
+        ----------
+        client_id : `int`
+            Client ID of the account that owns the folder.
+        prefix : `str`
+            Folder path, as a directory.
+
+        Returns
+        -------
+        folder_data : `List[FileData | Subdir]` or None
+            The cached listing, or None if it is not cached or has expired.
+        """
+
+        with self.__lock:
+            row = self.__conn.execute("SELECT fetched_at, data FROM listings WHERE client_id = ? AND prefix = ?",
+                                      (client_id, prefix)).fetchone()
+
+        if row is None or time.time()-row[0] > self.__ttl:
+            return None
+
+        return json.loads(row[1])
+
+    def put(self, client_id: int, prefix: str, folder_data: List[Union[FileData, Subdir]]):
+        """Stores a folder listing in the cache.
+
+        Parameters
+        ----------
+        client_id : `int`
+            Client ID of the account that owns the folder.
+        prefix : `str`
+            Folder path, as a directory.
+        folder_data : `List[FileData | Subdir]`
+            Folder listing returned by the server.
+        """
+
+        with self.__lock, self.__conn:
+            self.__conn.execute("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)",
+                                (client_id, prefix, time.time(), json.dumps(folder_data)))
+
+    def invalidate(self, client_id: int, prefix: Optional[str] = None, recursive: bool = False):
+        """Removes folder listings from the cache.
+
+        Parameters
+        ----------
+        client_id : `int`
+            Client ID of the account that owns the folder.
+        prefix : `str`, optional
+            Folder path, as a directory. (Default: None (all listings of the account are removed))
+        recursive : `bool`, optional
+            If True, the listings of all folders inside this folder are also removed. (Default: False)
+        """
+
+        with self.__lock, self.__conn:
+            if prefix is None:
+                self.__conn.execute("DELETE FROM listings WHERE client_id = ?", (client_id,))
+
+            elif recursive:
+                pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")+"%"
+                self.__conn.execute("DELETE FROM listings WHERE client_id = ? AND prefix LIKE ? ESCAPE '\\'",
+                                    (client_id, pattern))
+
+            else:
+                self.__conn.execute("DELETE FROM listings WHERE client_id = ? AND prefix = ?", (client_id, prefix))
+
+    def clear(self):
+        """Removes all listings from the cache"""
+
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM listings")
+
+    def close(self):
+        """Closes the database"""
+
+        with self.__lock:
+            self.__conn.close()
+
+
+__all__ = ["ListingCache"]
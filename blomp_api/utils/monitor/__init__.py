@@ -1,3 +1,4 @@
+from .aggregate_monitor import AggregateMonitor
 from .download_monitor import DownloadMonitor
-from .monitor import Monitor
+from .monitor import Monitor, MonitorCallback
 from .upload_monitor import UploadMonitor
@@ -0,0 +1,80 @@
+from .monitor import Monitor
+
+from typing import Iterable, List, Optional, Tuple
+import time
+
+
+class AggregateMonitor(Monitor):
+    """Class to monitor the combined progress of several transfers.
+
+    The transferred and total sizes are the sums of those of the added monitors, and the rates are measured over all of them.
+    The aggregate finishes when all the added monitors have finished, with the first error found, if any.
+
+    Parameters
+    ----------
+    monitors : `Iterable[Monitor]`, optional
+        Monitors of the transfers to be combined. More monitors can be added later with `add`. (Default: ())
+    rate_window : `float`, optional
+        Length, in seconds, of the window used to compute the moving average rate. (Default: 10.0)
+    """
+
+    def __init__(self, monitors: Iterable[Monitor] = (), rate_window: float = 10.0):
+        super().__init__(0, rate_window)
+        self.__monitors: List[Monitor] = []
+
+        for monitor in monitors:
+            self.add(monitor)
+
+    def __repr__(self) -> str:
+        return f"AggregateMonitor(monitors={len(self.__monitors)}, loaded={self._loaded}, total={self._total})"
+
+    def _update(self, loaded: int):
+        super()._update(loaded)
+
+    @property
+    def monitors(self) -> Tuple[Monitor, ...]:
+        """Monitors combined by this aggregate"""
+
+        return tuple(self.__monitors)
+
+    def add(self, monitor: Monitor):
+        """Adds the monitor of a transfer to this aggregate"""
+
+        # The monitor lock is held while its current size is read, so that no update is counted twice or lost
+        with monitor._lock:
+            with self._lock:
+                self.__monitors.append(monitor)
+                self._total += monitor._total
+                self._loaded += monitor._loaded
+
+                if self._start_clock is None and monitor._start_clock is not None:
+                    self._begin(time.monotonic())
+
+                if self._done.is_set() and not monitor._done.is_set():
+                    self._done.clear()
+                    self._finished_at = self._end_clock = self._error = None
+
+            monitor._aggregates.append(self)
+            finished = monitor._done.is_set()
+
+        if finished:
+            self._child_finished(monitor)
+
+    def _child_finished(self, monitor: Monitor):
+        if all(m.finished for m in self.__monitors):
+            self._finish(self.__first_error())
+
+    def __first_error(self) -> Optional[BaseException]:
+        for monitor in self.__monitors:
+            if monitor.error is not None:
+                return monitor.error
+
+        return None
+
+    def cancel(self):
+        """Cancels all the transfers of this aggregate"""
+
+        super().cancel()
+
+        for monitor in self.__monitors:
+            monitor.cancel()
@@ -1,18 +1,163 @@
-from typing import Any
+from ...exceptions import TransferCancelledError
+
+from collections import deque
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, Callable, Deque, List, Optional, Tuple
 import abc
+import time
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .aggregate_monitor import AggregateMonitor
+
+
+MonitorCallback = Callable[["Monitor"], Any]
 
 
 class Monitor(abc.ABC):
-    def __init__(self, total_size: int):
+    """Base class to monitor the progress of a transfer.
+
+    Besides the transferred size, a monitor measures the transfer rate over a sliding window of `rate_window` seconds,
+    records when the transfer started and finished, and calls its registered callbacks as the transfer progresses.
+
+    Parameters
+    ----------
+    total_size : `int`
+        Total size, in bytes, to be transferred.
+    rate_window : `float`, optional
+        Length, in seconds, of the window used to compute the moving average rate. (Default: 10.0)
+    """
+
+    __SAMPLE_INTERVAL = 0.05
+    __INSTANT_WINDOW = 1.0
+
+    def __init__(self, total_size: int, rate_window: float = 10.0):
         self._total = total_size
         self._loaded = 0
+        self._lock = Lock()
+        self._cancelled = False
+
+        self._rate_window = rate_window
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._start_clock: Optional[float] = None
+        self._end_clock: Optional[float] = None
+        self._error: Optional[BaseException] = None
+        self._done = Event()
+        self._callbacks: List[List[Any]] = []
+        self._aggregates: List["AggregateMonitor"] = []
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(loaded={self._loaded}, total={self._total})"
 
     @abc.abstractmethod
     def _update(self, loaded: Any):
-        self._loaded += loaded
+        if self._cancelled:
+            raise TransferCancelledError("Transfer cancelled")
+
+        self._record(loaded)
+
+    def _record(self, loaded: int):
+        now = time.monotonic()
+
+        with self._lock:
+            if self._start_clock is None:
+                self._begin(now)
+
+            self._loaded += loaded
+
+            if self._samples and now-self._samples[-1][0] < self.__SAMPLE_INTERVAL:
+                self._samples[-1] = (self._samples[-1][0], self._loaded)
+            else:
+                self._samples.append((now, self._loaded))
+
+            while len(self._samples) > 2 and now-self._samples[1][0] >= self._rate_window:
+                self._samples.popleft()
+
+            callbacks = self.__due_callbacks(now)
+            aggregates = list(self._aggregates)
+
+        for aggregate in aggregates:
+            aggregate._record(loaded)
+
+        for callback in callbacks:
+            callback(self)
+
+    def _begin(self, clock: float):
+        self._started_at = time.time()
+        self._start_clock = clock
+        self._samples.append((clock, self._loaded))
+
+    def __due_callbacks(self, now: float, force: bool = False) -> List[MonitorCallback]:
+        due = []
+        for entry in self._callbacks:
+            callback, interval, last_call = entry
+            if force or now-last_call >= interval:
+                entry[2] = now
+                due.append(callback)
+
+        return due
+
+    def _start(self):
+        """Records that the transfer started, if it has not started yet"""
+
+        with self._lock:
+            if self._start_clock is None:
+                self._begin(time.monotonic())
+
+    def _finish(self, error: Optional[BaseException] = None):
+        """Records that the transfer finished, successfully if `error` is None"""
+
+        with self._lock:
+            if self._done.is_set():
+                return
+
+            now = time.monotonic()
+            if self._start_clock is None:
+                self._begin(now)
+
+            self._finished_at = time.time()
+            self._end_clock = now
+            self._error = error
+            callbacks = self.__due_callbacks(now, True)
+            aggregates = list(self._aggregates)
+
+        self._done.set()
+
+        for aggregate in aggregates:
+            aggregate._child_finished(self)
+
+        for callback in callbacks:
+            callback(self)
+
+    def _track(self, target: Callable[..., Any], *args: Any):
+        """Runs `target`, recording when the transfer starts and finishes"""
+
+        self._start()
+
+        try:
+            target(*args)
+        except BaseException as e:
+            self._finish(e)
+            raise
+
+        self._finish()
+
+    def _finish_task(self, task: "asyncio.Future[Any]"):
+        """Records that the transfer run by an asyncio task finished"""
+
+        if task.cancelled():
+            self._finish(TransferCancelledError("Transfer cancelled"))
+        else:
+            self._finish(task.exception())
+
+    @property
+    def cancelled(self) -> bool:
+        """True, if the transfer has been cancelled"""
+
+        return self._cancelled
 
     @property
     def total(self) -> int:
@@ -30,4 +175,122 @@ class Monitor(abc.ABC):
     def progress(self) -> float:
         """File loaded progress, between [0, 1] (basically, loaded_size/total_size)"""
 
-        return self._loaded/self._total
+        return self._loaded/self._total if self._total else float(self.finished)
+
+    @property
+    def started_at(self) -> Optional[float]:
+        """Timestamp (as returned by `time.time`) when the transfer started, or None, if it has not started"""
+
+        return self._started_at
+
+    @property
+    def finished_at(self) -> Optional[float]:
+        """Timestamp (as returned by `time.time`) when the transfer finished, or None, if it has not finished"""
+
+        return self._finished_at
+
+    @property
+    def elapsed(self) -> float:
+        """Time, in seconds, since the transfer started, or its duration, if it has finished"""
+
+        with self._lock:
+            if self._start_clock is None:
+                return 0.0
+
+            return (self._end_clock or time.monotonic())-self._start_clock
+
+    @property
+    def finished(self) -> bool:
+        """True, if the transfer has finished, successfully or not"""
+
+        return self._done.is_set()
+
+    @property
+    def succeeded(self) -> bool:
+        """True, if the transfer has finished successfully"""
+
+        return self._done.is_set() and self._error is None
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Exception that stopped the transfer, if any"""
+
+        return self._error
+
+    @property
+    def average_rate(self) -> float:
+        """Average transfer rate, in bytes per second, since the transfer started"""
+
+        elapsed = self.elapsed
+        return self._loaded/elapsed if elapsed > 0 else 0.0
+
+    @property
+    def rate(self) -> float:
+        """Moving average of the transfer rate, in bytes per second, over the last `rate_window` seconds"""
+
+        return self.__window_rate(self._rate_window)
+
+    @property
+    def instant_rate(self) -> float:
+        """Transfer rate, in bytes per second, over the last second"""
+
+        return self.__window_rate(self.__INSTANT_WINDOW)
+
+    def __window_rate(self, window: float) -> float:
+        with self._lock:
+            if self._start_clock is None or not self._samples:
+                return 0.0
+
+            now = self._end_clock or time.monotonic()
+            last_loaded = self._samples[-1][1]
+
+            first_clock, first_loaded = self._samples[0]
+            for clock, loaded in reversed(self._samples):
+                if now-clock > window:
+                    first_clock, first_loaded = clock, loaded
+                    break
+
+        elapsed = now-first_clock
+        return (last_loaded-first_loaded)/elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated time, in seconds, to finish the transfer, based on the moving average rate.
+        It is None, if the rate is still unknown."""
+
+        if self.finished:
+            return 0.0
+
+        rate = self.rate
+        return max(self._total-self._loaded, 0)/rate if rate > 0 else None
+
+    def add_callback(self, callback: MonitorCallback, min_interval: float = 0.5):
+        """Registers a function called with this monitor as the transfer progresses.
+
+        Parameters
+        ----------
+        callback : `Callable[[Monitor], Any]`
+            Function to be called. It runs in the thread doing the transfer, so it must return quickly.
+        min_interval : `float`, optional
+            Minimum time, in seconds, between two calls. The function is always called when the transfer finishes.
+            (Default: 0.5)
+        """
+
+        with self._lock:
+            self._callbacks.append([callback, min_interval, float("-inf")])
+
+    def remove_callback(self, callback: MonitorCallback):
+        """Unregisters a function registered with `add_callback`"""
+
+        with self._lock:
+            self._callbacks = [entry for entry in self._callbacks if entry[0] is not callback]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the transfer finishes or `timeout` seconds have passed. Returns True, if the transfer has finished."""
+
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Cancels the transfer. It stops before the next block of content is transferred."""
+
+        self._cancelled = True
@@ -1,5 +1,8 @@
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
+from weakref import WeakValueDictionary
+
 import re
+import sys
 
 
 class Path:
@@ -11,27 +14,53 @@ class Path:
         Path to be represented by this class.
     path_char : `str`, optional
         Character to be used as separator of path components. (Default: '/')
+
+    Notes
+    -----
+    Path components are interned, and paths built by joining or by the `parent` property are shared between equal paths,
+    so that many paths with a common prefix take little memory. Joining paths does not parse them again.
     """
 
+    __slots__ = ("__path_char", "__path_parts", "__path_str", "__dir_str", "__parent", "__weakref__")
+
+    __interned: "WeakValueDictionary[Tuple[Tuple[str, ...], str], Path]" = WeakValueDictionary()
+
     def __init__(self, initial_path: str = "", path_char: str = "/"):
         self.__path_char = path_char
-        self.__path_parts = tuple(filter(None, re.split(r"/|\\", initial_path)))
-        self.__path_str = path_char.join(self.__path_parts)
+        self.__path_parts = self.__split(initial_path)
+        self.__path_str: Optional[str] = None
+        self.__dir_str: Optional[str] = None
+        self.__parent: Optional[Path] = None
+        self.__interned.setdefault((self.__path_parts, path_char), self)
 
     def __bool__(self) -> bool:
         return bool(self.__path_parts)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Path):
+            return NotImplemented
+
+        return self.__path_parts == other.__path_parts and self.__path_char == other.__path_char
+
+    def __hash__(self) -> int:
+        return hash(self.__path_parts)
+
     def __repr__(self) -> str:
-        return f"Path({self.__path_str})"
+        return f"Path({self})"
 
     def __str__(self) -> str:
+        if self.__path_str is None:
+            self.__path_str = self.__path_char.join(self.__path_parts)
+
         return self.__path_str
 
     def __truediv__(self, path_: Union["Path", str]) -> "Path":
-        if isinstance(path_, str):
-            path_ = Path(path_)
+        parts = self.__split(path_) if isinstance(path_, str) else path_.__path_parts
 
-        return Path(self.__path_char.join(self.__path_parts+path_.__path_parts))
+        if not parts:
+            return self
+
+        return self.__from_parts(self.__path_parts+parts, self.__path_char)
 
     def __rtruediv__(self, path_: Union["Path", str]) -> "Path":
         if isinstance(path_, str):
@@ -39,6 +68,29 @@ class Path:
 
         return path_/self
 
+    @staticmethod
+    def __split(path_: str) -> Tuple[str, ...]:
+        if "/" not in path_ and "\\" not in path_:
+            return (sys.intern(path_),) if path_ else ()
+
+        return tuple(map(sys.intern, filter(None, re.split(r"/|\\", path_))))
+
+    @classmethod
+    def __from_parts(cls, parts: Tuple[str, ...], path_char: str) -> "Path":
+        key = (parts, path_char)
+        path_ = cls.__interned.get(key)
+
+        if path_ is None:
+            path_ = cls.__new__(cls)
+            path_.__path_char = path_char
+            path_.__path_parts = parts
+            path_.__path_str = None
+            path_.__dir_str = None
+            path_.__parent = None
+            cls.__interned[key] = path_
+
+        return path_
+
     @property
     def parts(self) -> Tuple[str, ...]:
         """A tuple of strings with path components"""
@@ -49,7 +101,10 @@ class Path:
     def parent(self) -> "Path":
         """Parent path of this path"""
 
-        return Path(self.__path_char.join(self.__path_parts[:-1]))
+        if self.__parent is None:
+            self.__parent = self.__from_parts(self.__path_parts[:-1], self.__path_char)
+
+        return self.__parent
 
     def as_dir(self, start_sep: bool = False, end_sep: bool = True) -> str:
         """Representation of this path as a directory, with the separator character being added to the beginning and/or end of the path.
@@ -71,7 +126,13 @@ class Path:
         The path separator character is the same as that provided by the `path_char` parameter during the initialization of this class. (Default: '/')
         """
 
+        if not start_sep and end_sep:
+            if self.__dir_str is None:
+                self.__dir_str = str(self)+self.__path_char
+
+            return self.__dir_str
+
         s = self.__path_char if start_sep else ""
         e = self.__path_char if end_sep else ""
 
-        return s+self.__path_str+e
+        return s+str(self)+e
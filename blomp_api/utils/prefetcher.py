@@ -0,0 +1,49 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class Prefetcher:
+    """Loads folder listings in background threads, so that they are ready when they are accessed.
+
+    When the contents of a folder are accessed for the first time, the listings of its subfolders are loaded by this object.
+
+    Parameters
+    ----------
+    max_workers : `int`, optional
+        Maximum number of listings loaded at the same time. (Default: 4)
+    """
+
+    def __init__(self, max_workers: int = 4):
+        if max_workers <= 0:
+            raise ValueError("Maximum number of workers must be greater than zero")
+
+        self.__max_workers = max_workers
+        self.__executor = ThreadPoolExecutor(max_workers, thread_name_prefix="blomp-prefetch")
+
+    def __repr__(self) -> str:
+        return f"Prefetcher(max_workers={self.__max_workers})"
+
+    @property
+    def max_workers(self) -> int:
+        """Maximum number of listings loaded at the same time"""
+
+        return self.__max_workers
+
+    def prefetch(self, load: Callable[[], Any]) -> Future:
+        """Schedules a function that loads a listing. Errors raised by it are ignored, so the listing is loaded again when accessed."""
+
+        return self.__executor.submit(load)
+
+    def shutdown(self, wait: bool = True):
+        """Stops loading listings
+
+        Parameters
+        ----------
+        wait : `bool`, optional
+            If True, waits until the listings being loaded are finished. (Default: True)
+        """
+
+        self.__executor.shutdown(wait)
+
+
+__all__ = ["Prefetcher"]
@@ -0,0 +1,23 @@
+from typing import List, Tuple
+
+
+def split_range(total_size: int, part_size: int) -> List[Tuple[int, int]]:
+    """Splits a byte range of `total_size` bytes in consecutive parts of at most `part_size` bytes.
+
+    Parameters
+    ----------
+    total_size : `int`
+        Size, in bytes, of the range to be split.
+    part_size : `int`
+        Maximum size, in bytes, of each part.
+
+    Returns
+    -------
+    parts : `List[Tuple[int, int]]`
+        A list of `(offset, size)` tuples, in ascending order of offset.
+    """
+
+    if part_size <= 0:
+        raise ValueError("Part size must be greater than zero")
+
+    return [(offset, min(part_size, total_size-offset)) for offset in range(0, total_size, part_size)]
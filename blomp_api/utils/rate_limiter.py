@@ -0,0 +1,155 @@
+from threading import Lock
+from typing import Callable, Iterable, Optional
+
+import time
+
+
+class TokenBucket:
+    """Token bucket that limits the rate of a flow of bytes, shared by any number of threads.
+
+    Parameters
+    ----------
+    rate : `float`, optional
+        Maximum rate, in bytes per second. If None, the rate is not limited. (Default: None)
+    burst : `int`, optional
+        Maximum number of bytes that can be consumed at once after the bucket has been idle.
+        If None, it is the number of bytes of one second at the current rate. (Default: None)
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__lock = Lock()
+        self.__tokens = float(self.capacity)
+        self.__last = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.__rate}, burst={self.__burst})"
+
+    def __refill(self, now: float):
+        if self.__rate is not None:
+            self.__tokens = min(self.__tokens+(now-self.__last)*self.__rate, self.capacity)
+
+        self.__last = now
+
+    @property
+    def capacity(self) -> float:
+        """Maximum number of tokens held by the bucket"""
+
+        if self.__burst is not None:
+            return self.__burst
+
+        return self.__rate or 0.0
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Maximum rate, in bytes per second, or None, if the rate is not limited. It can be changed at any time."""
+
+        return self.__rate
+
+    @rate.setter
+    def rate(self, rate: Optional[float]):
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__rate = rate
+            self.__tokens = min(self.__tokens, self.capacity)
+
+    def consume(self, amount: int):
+        """Takes `amount` tokens from the bucket, blocking until the rate allows them to be used"""
+
+        with self.__lock:
+            if self.__rate is None or amount <= 0:
+                return
+
+            self.__refill(time.monotonic())
+            self.__tokens -= amount
+            delay = -self.__tokens/self.__rate
+
+        # The debt of a large block is paid by sleeping, so that blocks of any size can be consumed
+        if delay > 0:
+            time.sleep(delay)
+
+
+class BandwidthLimiter:
+    """Limits the total rates of uploads and downloads, each one with its own token bucket.
+
+    A limiter can be attached to the session (see `Blomp`) or to a `TransferManager`,
+    and the limits apply to all the transfers using it together.
+
+    Parameters
+    ----------
+    upload_rate : `float`, optional
+        Maximum upload rate, in bytes per second. If None, uploads are not limited. (Default: None)
+    download_rate : `float`, optional
+        Maximum download rate, in bytes per second. If None, downloads are not limited. (Default: None)
+
+    Examples
+    --------
+    >>> limiter = BandwidthLimiter(upload_rate=2*1024*1024)
+    >>> blomp = Blomp("email", "password", bandwidth_limiter=limiter)
+    >>> limiter.upload_rate = 512*1024  # It can be changed while transfers are running
+    """
+
+    def __init__(self, upload_rate: Optional[float] = None, download_rate: Optional[float] = None):
+        self.__upload = TokenBucket(upload_rate)
+        self.__download = TokenBucket(download_rate)
+
+    def __repr__(self) -> str:
+        return f"BandwidthLimiter(upload_rate={self.upload_rate}, download_rate={self.download_rate})"
+
+    @property
+    def download(self) -> TokenBucket:
+        """Token bucket of downloads"""
+
+        return self.__download
+
+    @property
+    def download_rate(self) -> Optional[float]:
+        """Maximum download rate, in bytes per second, or None, if downloads are not limited"""
+
+        return self.__download.rate
+
+    @download_rate.setter
+    def download_rate(self, rate: Optional[float]):
+        self.__download.rate = rate
+
+    @property
+    def upload(self) -> TokenBucket:
+        """Token bucket of uploads"""
+
+        return self.__upload
+
+    @property
+    def upload_rate(self) -> Optional[float]:
+        """Maximum upload rate, in bytes per second, or None, if uploads are not limited"""
+
+        return self.__upload.rate
+
+    @upload_rate.setter
+    def upload_rate(self, rate: Optional[float]):
+        self.__upload.rate = rate
+
+
+def limit_rate(update_func: Callable[[int], None], buckets: Iterable[TokenBucket]) -> Callable[[int], None]:
+    """Returns a function that calls `update_func` and then consumes the transferred size from all the given buckets"""
+
+    buckets = tuple(buckets)
+    if not buckets:
+        return update_func
+
+    def update(loaded: int):
+        update_func(loaded)
+
+        for bucket in buckets:
+            bucket.consume(loaded)
+
+    return update
+
+
+__all__ = ["BandwidthLimiter", "TokenBucket", "limit_rate"]
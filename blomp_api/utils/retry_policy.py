@@ -0,0 +1,230 @@
+from ..exceptions import CircuitOpenError
+
+from email.utils import parsedate_to_datetime
+from requests import Response
+from requests.exceptions import ChunkedEncodingError, ConnectTimeout, ConnectionError, Timeout
+from threading import Lock
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+import datetime
+import random
+import time
+
+
+# Endpoints that only read data, so they can be requested again without side effects
+IDEMPOTENT_PATHS = frozenset({
+    "/dashboard/folder",
+    "/dashboard/index",
+    "/dashboard/file/share/link",
+    "/dashboard/storage/download_object",
+})
+
+
+class RetryPolicy:
+    """Timeouts and retry rules applied to the requests of a session.
+
+    Read requests (see `IDEMPOTENT_PATHS`) are retried after connection errors, timeouts and the status codes in
+    `retry_statuses`. Other requests, such as moving, renaming and deleting files, are only retried when they certainly
+    have not been processed by the server: when the connection could not be established or the status code is 429.
+
+    The waiting time between attempts grows exponentially with random jitter, and follows the `Retry-After` header,
+    when the server sends one. After `breaker_threshold` consecutive failures, the circuit breaker opens, and requests fail
+    at once with `CircuitOpenError` for `breaker_cooldown` seconds.
+
+    Parameters
+    ----------
+    connect_timeout : `float`, optional
+        Maximum time, in seconds, to establish a connection. If None, there is no limit. (Default: 10.0)
+    read_timeout : `float`, optional
+        Maximum time, in seconds, waiting for data from the server. If None, there is no limit. (Default: 60.0)
+    retries : `int`, optional
+        Maximum number of retries of each request. (Default: 3)
+    backoff : `float`, optional
+        Base waiting time, in seconds, doubled at each retry. (Default: 0.5)
+    max_backoff : `float`, optional
+        Maximum waiting time, in seconds, between two attempts, including the time asked by `Retry-After`. (Default: 30.0)
+    retry_statuses : `Iterable[int]`, optional
+        Status codes that make read requests be retried. (Default: (429, 500, 502, 503, 504))
+    breaker_threshold : `int`, optional
+        Number of consecutive failures that open the circuit breaker. If None, there is no circuit breaker. (Default: 10)
+    breaker_cooldown : `float`, optional
+        Time, in seconds, that the circuit breaker stays open. (Default: 30.0)
+    idempotent_paths : `Iterable[str]`, optional
+        URL paths of requests that can be retried without side effects. (Default: IDEMPOTENT_PATHS)
+    """
+
+    def __init__(self, connect_timeout: Optional[float] = 10.0, read_timeout: Optional[float] = 60.0, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 30.0, retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 breaker_threshold: Optional[int] = 10, breaker_cooldown: float = 30.0,
+                 idempotent_paths: Iterable[str] = IDEMPOTENT_PATHS):
+        if retries < 0:
+            raise ValueError('"retries" must not be negative')
+
+        if breaker_threshold is not None and breaker_threshold <= 0:
+            raise ValueError('"breaker_threshold" must be greater than zero')
+
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__retry_statuses = frozenset(retry_statuses)
+        self.__breaker_threshold = breaker_threshold
+        self.__breaker_cooldown = breaker_cooldown
+        self.__idempotent_paths = frozenset(idempotent_paths)
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(timeout={self.timeout}, retries={self.__retries})"
+
+    @property
+    def breaker_cooldown(self) -> float:
+        """Time, in seconds, that the circuit breaker stays open"""
+
+        return self.__breaker_cooldown
+
+    @property
+    def breaker_threshold(self) -> Optional[int]:
+        """Number of consecutive failures that open the circuit breaker, or None, if there is no circuit breaker"""
+
+        return self.__breaker_threshold
+
+    @property
+    def retries(self) -> int:
+        """Maximum number of retries of each request"""
+
+        return self.__retries
+
+    @property
+    def timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """Connect and read timeouts, in the format accepted by `requests`"""
+
+        return self.__connect_timeout, self.__read_timeout
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        """Returns True, if a request can be sent again without side effects"""
+
+        return method.upper() in ("GET", "HEAD", "OPTIONS") and urlsplit(url).path.rstrip("/") in self.__idempotent_paths
+
+    def should_retry(self, idempotent: bool, response: Optional[Response] = None, error: Optional[Exception] = None) -> bool:
+        """Returns True, if a request that got `response` or raised `error` should be sent again"""
+
+        if response is not None:
+            return response.status_code == 429 or (idempotent and response.status_code in self.__retry_statuses)
+
+        if idempotent:
+            return isinstance(error, (ConnectionError, Timeout, ChunkedEncodingError))
+
+        return self.__not_sent(error)
+
+    def is_retry_status(self, status: int) -> bool:
+        """Returns True, if the status code is one of `retry_statuses`"""
+
+        return status in self.__retry_statuses
+
+    def is_failure(self, response: Optional[Response] = None, error: Optional[Exception] = None) -> bool:
+        """Returns True, if a request result counts as a failure of the server for the circuit breaker"""
+
+        if response is not None:
+            return response.status_code in self.__retry_statuses
+
+        return isinstance(error, (ConnectionError, Timeout, ChunkedEncodingError))
+
+    @staticmethod
+    def __not_sent(error: Optional[Exception]) -> bool:
+        if isinstance(error, ConnectTimeout):
+            return True
+
+        if isinstance(error, ConnectionError) and error.args:
+            reason = error.args[0]
+            if isinstance(reason, MaxRetryError):
+                reason = reason.reason
+
+            return isinstance(reason, NewConnectionError)
+
+        return False
+
+    def delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """Returns the time, in seconds, to wait before the retry number `attempt` (starting at 1)"""
+
+        delay = random.uniform(0, min(self.__max_backoff, self.__backoff*2**(attempt-1)))
+
+        if response is not None:
+            retry_after = self.__retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        return min(delay, self.__max_backoff)
+
+    @staticmethod
+    def __retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+
+        return max((date-datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    Parameters
+    ----------
+    threshold : `int`
+        Number of consecutive failures that open the circuit.
+    cooldown : `float`
+        Time, in seconds, that the circuit stays open. After it, one more failure opens the circuit again.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.__threshold = threshold
+        self.__cooldown = cooldown
+        self.__lock = Lock()
+        self.__failures = 0
+        self.__open_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(failures={self.__failures}, open={self.open})"
+
+    @property
+    def open(self) -> bool:
+        """True, if requests are being rejected"""
+
+        return time.monotonic() < self.__open_until
+
+    def check(self):
+        """Raises `CircuitOpenError`, if the circuit is open"""
+
+        remaining = self.__open_until-time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"Too many failed requests. Requests are blocked for {remaining:.1f} seconds")
+
+    def record(self, failure: bool):
+        """Records the result of a request"""
+
+        with self.__lock:
+            if not failure:
+                self.__failures = 0
+                return
+
+            self.__failures += 1
+            if self.__failures >= self.__threshold:
+                self.__open_until = time.monotonic()+self.__cooldown
+                # After the cooldown, a single failure is enough to open the circuit again
+                self.__failures = self.__threshold-1
+
+
+__all__ = ["CircuitBreaker", "IDEMPOTENT_PATHS", "RetryPolicy"]
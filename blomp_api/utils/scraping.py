@@ -0,0 +1,40 @@
+from typing import Dict, Tuple
+import re
+
+
+def parse_login_page(content: str) -> Tuple[str, int]:
+    """Gets the CSRF token and the client ID from the page returned after login.
+
+    Returns
+    -------
+    token : `str`
+        CSRF token of the session.
+    client_id : `int`
+        Client ID of the account.
+    """
+
+    token = re.findall(r'<meta name="csrf-token" content="(.+)"\x20?/?>', content)[0]
+    client_id = int(re.findall(r'<input type="hidden" id="clientId" value="(\d+)">', content)[0])
+
+    return token, client_id
+
+
+def parse_account_info(index_page: str) -> Dict[str, str]:
+    """Gets the account information shown in the dashboard index page.
+
+    Returns
+    -------
+    info : `Dict[str, str]`
+        A dictionary whose keys are "used_storage", "avaliable_storage", "storage_capacity", "shared_files" and "files_and_folders".
+        Information that cannot be found in the page is not included.
+    """
+
+    blomp_info = dict(
+        used_storage=re.search(r'<h5>Used Storage: (.+)</h5>', index_page),
+        avaliable_storage=re.search(r'<h5>Available Storage: (.+)</h5>', index_page),
+        storage_capacity=re.search(r'Storage Capacity:\n(.+)</h5>', index_page),
+        shared_files=re.search(r'<h5>Shared Files: (.+)</h5>', index_page),
+        files_and_folders=re.search(r'<h5>Files & Folders: (.+)</h5>', index_page)
+    )
+
+    return {attr: match.groups()[0] for attr, match in blomp_info.items() if match}
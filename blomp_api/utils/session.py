@@ -1,11 +1,224 @@
-from requests import Session as SS
+from ..response_types import ShareLinkResponse
+from .connection_pool import ConnectionPool
+from .hedging import HedgingPolicy
+from .listing_cache import ListingCache
+from .prefetcher import Prefetcher
+from .rate_limiter import BandwidthLimiter
+from .retry_policy import CircuitBreaker, RetryPolicy
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from requests import Response, Session as SS
+from requests.adapters import HTTPAdapter
+from threading import Lock, local
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import json
+import os
+import pathlib
+import time
 
 
 class Session(SS):
-    def __init__(self):
+    def __init__(self, pool_size: int = 10, retry_policy: Optional[RetryPolicy] = None):
         super().__init__()
         self.__token: str = ""
         self.__client_id: int = 0
+        self.__connection_pool = ConnectionPool(pool_size)
+        self.__listing_cache: Optional[ListingCache] = None
+        self.__prefetcher: Optional[Prefetcher] = None
+        self.__bandwidth_limiter: Optional[BandwidthLimiter] = None
+        self.__retry_policy: Optional[RetryPolicy] = None
+        self.__breaker: Optional[CircuitBreaker] = None
+        self.__hedging: Optional[HedgingPolicy] = None
+        self.__hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.__lock = Lock()
+        self.__authenticator: Optional[Callable[[], None]] = None
+        self.__auth_lock = Lock()
+        self.__local = local()
+        self.__share_links: Dict[str, ShareLinkResponse] = {}
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+    def request(self, method: str, url: str, *args: Any, idempotent: Optional[bool] = None, **kwargs: Any) -> Response:
+        """Sends a request, applying the timeouts and retries of the retry policy, and the hedging policy, if any.
+
+        The `idempotent` parameter overrides the classification of the request by the retry policy.
+        """
+
+        token = self.__token
+        response = self.__dispatch(method, url, idempotent, args, kwargs)
+
+        if self.__authenticator is None or getattr(self.__local, "authenticating", False) or not self.__logged_out(response):
+            return response
+
+        response.close()
+        self.renew(token)
+
+        for key in ("params", "data"):
+            if isinstance(kwargs.get(key), dict):
+                kwargs[key] = {k: self.__token if k == "_token" else v for k, v in kwargs[key].items()}
+
+        return self.__dispatch(method, url, idempotent, args, kwargs)
+
+    def authenticate(self):
+        """Signs in by calling the authenticator. The requests made by it are not checked for an expired session,
+        so a failed sign in is not attempted again."""
+
+        with self.__auth_lock:
+            self.__authenticate()
+
+    def renew(self, token: str) -> bool:
+        """Signs in again after a request made with `token` found the session expired,
+        unless another thread has already done it.
+
+        Parameters
+        ----------
+        token : `str`
+            CSRF token of the session when the request was made.
+
+        Returns
+        -------
+        renewed : `bool`
+            False, if the session has no authenticator or is signing in, so the request must not be sent again.
+        """
+
+        if self.__authenticator is None or getattr(self.__local, "authenticating", False):
+            return False
+
+        with self.__auth_lock:
+            if self.__token == token:
+                self.__authenticate()
+
+        return True
+
+    def __authenticate(self):
+        if self.__authenticator is None:
+            raise RuntimeError("The session has no authenticator")
+
+        self.__local.authenticating = True
+        try:
+            self.__authenticator()
+        finally:
+            self.__local.authenticating = False
+
+    @staticmethod
+    def __logged_out(response: Response) -> bool:
+        # Requests made without a valid session are redirected to the login page
+        if response.status_code in (401, 419):
+            return True
+
+        url = urlsplit(response.url)
+        return bool(response.history) and url.netloc == "dashboard.blomp.com" and url.path.rstrip("/") in ("", "/login")
+
+    def __dispatch(self, _method: str, _url: str, _idempotent: Optional[bool], _args: Tuple[Any, ...],
+                   _kwargs: Dict[str, Any]) -> Response:
+        hedging = self.__hedging
+        if hedging is not None and _idempotent is not False and hedging.applies_to(_method, _url):
+            return self.__hedged_request(hedging, _method, _url, _args, _kwargs)
+
+        return self.__request(_method, _url, _idempotent, _args, _kwargs)
+
+    def __hedged_request(self, _hedging: HedgingPolicy, _method: str, _url: str, _args: Tuple[Any, ...],
+                         _kwargs: Dict[str, Any]) -> Response:
+        with self.__lock:
+            if self.__hedge_executor is None:
+                self.__hedge_executor = ThreadPoolExecutor(2*self.__connection_pool.maxsize, "hedged-request")
+
+            executor = self.__hedge_executor
+
+        def attempt() -> Response:
+            start = time.monotonic()
+            response = self.__request(_method, _url, True, _args, _kwargs)
+            _hedging.record(time.monotonic()-start)
+            return response
+
+        first = executor.submit(attempt)
+        if wait([first], _hedging.delay())[0] or not _hedging.acquire():
+            return first.result()
+
+        futures = {first, executor.submit(attempt)}
+        while True:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+
+            # If the first request to finish failed, the other one can still succeed
+            if succeeded or not futures:
+                winner = succeeded[0] if succeeded else done.pop()
+
+                # The slower responses are discarded when they arrive
+                for other in futures | (done-{winner}):
+                    other.add_done_callback(self.__discard_response)
+
+                return winner.result()
+
+    @staticmethod
+    def __discard_response(future: "Future[Response]"):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def __request(self, _method: str, _url: str, _idempotent: Optional[bool], _args: Tuple[Any, ...],
+                  _kwargs: Dict[str, Any]) -> Response:
+        policy = self.__retry_policy
+        if policy is None:
+            return super().request(_method, _url, *_args, **_kwargs)
+
+        kwargs = dict(_kwargs)
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = policy.timeout
+
+        idempotent = policy.is_idempotent(_method, _url) if _idempotent is None else _idempotent
+
+        attempt = 0
+        while True:
+            if self.__breaker is not None:
+                self.__breaker.check()
+
+            try:
+                response = super().request(_method, _url, *_args, **kwargs)
+            except Exception as e:
+                self.__record(policy.is_failure(error=e))
+
+                if attempt >= policy.retries or not policy.should_retry(idempotent, error=e):
+                    raise
+
+                attempt += 1
+                time.sleep(policy.delay(attempt))
+                continue
+
+            self.__record(policy.is_failure(response))
+
+            if attempt >= policy.retries or not policy.should_retry(idempotent, response):
+                return response
+
+            attempt += 1
+            delay = policy.delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+
+    def __record(self, failure: bool):
+        if self.__breaker is not None:
+            self.__breaker.record(failure)
+
+    @property
+    def authenticator(self) -> Optional[Callable[[], None]]:
+        """Function that signs in again when the session expires, if any"""
+
+        return self.__authenticator
+
+    @authenticator.setter
+    def authenticator(self, authenticator: Optional[Callable[[], None]]):
+        self.__authenticator = authenticator
+
+    @property
+    def bandwidth_limiter(self) -> Optional[BandwidthLimiter]:
+        """Limiter of the upload and download rates, if any"""
+
+        return self.__bandwidth_limiter
+
+    @bandwidth_limiter.setter
+    def bandwidth_limiter(self, limiter: Optional[BandwidthLimiter]):
+        self.__bandwidth_limiter = limiter
 
     @property
     def client_id(self):
@@ -15,6 +228,58 @@ class Session(SS):
     def client_id(self, id_: int):
         self.__client_id = id_
 
+    @property
+    def connection_pool(self) -> ConnectionPool:
+        """Pool of keep-alive connections used by uploads"""
+
+        return self.__connection_pool
+
+    @property
+    def hedging(self) -> Optional[HedgingPolicy]:
+        """Rules to duplicate slow read requests, if any"""
+
+        return self.__hedging
+
+    @hedging.setter
+    def hedging(self, hedging: Optional[HedgingPolicy]):
+        self.__hedging = hedging
+
+    @property
+    def listing_cache(self) -> Optional[ListingCache]:
+        """Cache of folder listings, if any"""
+
+        return self.__listing_cache
+
+    @listing_cache.setter
+    def listing_cache(self, cache: Optional[ListingCache]):
+        self.__listing_cache = cache
+
+    @property
+    def prefetcher(self) -> Optional[Prefetcher]:
+        """Background loader of folder listings, if any"""
+
+        return self.__prefetcher
+
+    @prefetcher.setter
+    def prefetcher(self, prefetcher: Optional[Prefetcher]):
+        self.__prefetcher = prefetcher
+
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """Timeouts and retry rules of the requests. If None, requests have no timeout and are not retried."""
+
+        return self.__retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]):
+        self.__retry_policy = policy
+        self.__connection_pool.timeout = None if policy is None else policy.timeout[1]
+
+        if policy is None or policy.breaker_threshold is None:
+            self.__breaker = None
+        else:
+            self.__breaker = CircuitBreaker(policy.breaker_threshold, policy.breaker_cooldown)
+
     @property
     def token(self) -> str:
         return self.__token
@@ -23,5 +288,97 @@ class Session(SS):
     def token(self, tok: str):
         self.__token = tok
 
+    def load_state(self, path: Union[str, pathlib.Path], account: str) -> bool:
+        """Restores the cookies, the token and the client ID saved with `save_state`.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            Path of the session file.
+        account : `str`
+            Account that the session must belong to.
+
+        Returns
+        -------
+        restored : `bool`
+            False, if the file does not exist, cannot be read, or belongs to another account.
+        """
+
+        try:
+            with open(path) as f:
+                state = json.load(f)
+
+            if state["account"] != account:
+                return False
+
+            for cookie in state["cookies"]:
+                self.cookies.set(**cookie)
+
+            self.__token = state["token"]
+            self.__client_id = state["client_id"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        return True
+
+    def save_state(self, path: Union[str, pathlib.Path], account: str):
+        """Saves the cookies, the token and the client ID of the session to a file readable only by its owner.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            Path of the session file.
+        account : `str`
+            Account that the session belongs to.
+        """
+
+        cookies = [dict(name=c.name, value=c.value, domain=c.domain, path=c.path, secure=c.secure, expires=c.expires)
+                   for c in self.cookies]
+        state = dict(account=account, token=self.__token, client_id=self.__client_id, cookies=cookies)
+
+        tmp = f"{path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+
+        os.replace(tmp, path)
+
+    def invalidate_listing(self, prefix: str, recursive: bool = False):
+        """Removes a folder listing from the listing cache, if there is one"""
+
+        if self.__listing_cache is not None:
+            self.__listing_cache.invalidate(self.__client_id, prefix, recursive)
+
+    def share_link(self, path: str) -> Optional[ShareLinkResponse]:
+        """Gets the share information of a file stored with `store_share_link`, if any"""
+
+        with self.__lock:
+            return self.__share_links.get(path)
+
+    def store_share_link(self, path: str, info: ShareLinkResponse):
+        """Stores the share information of a file, so that it is not requested again"""
+
+        with self.__lock:
+            self.__share_links[path] = info
+
+    def invalidate_share_link(self, path: str, recursive: bool = False):
+        """Removes the share information of a file, or of all files inside a folder, if `recursive` is True"""
+
+        with self.__lock:
+            if recursive:
+                for key in [key for key in self.__share_links if key.startswith(path)]:
+                    del self.__share_links[key]
+            else:
+                self.__share_links.pop(path, None)
+
+    def close(self):
+        with self.__lock:
+            if self.__hedge_executor is not None:
+                self.__hedge_executor.shutdown(wait=False)
+                self.__hedge_executor = None
+
+        super().close()
+        self.__connection_pool.close()
+
 
 __all__ = ["Session"]
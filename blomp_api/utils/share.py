@@ -0,0 +1,25 @@
+from typing import Iterable, Optional
+
+
+def email_field(emails: Optional[Iterable[str]]) -> str:
+    """Formats e-mails as the value of the `email` field of a share request.
+
+    The value is the same for any kind of iterable, as a list of quoted e-mails without spaces, like `['a@b.com','c@d.com']`.
+
+    Parameters
+    ----------
+    emails : `Iterable[str]` or None
+        E-mails that will receive a shared link.
+
+    Returns
+    -------
+    field : `str`
+        The formatted e-mails, or an empty string if there are no e-mails.
+    """
+
+    emails = [] if emails is None else list(emails)
+
+    if not all(map(lambda o: isinstance(o, str), emails)):
+        raise TypeError("All e-mails must be string")
+
+    return str(emails).replace(" ", '') if emails else ""
@@ -0,0 +1,279 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import bisect
+import json
+import os
+import pathlib
+import stat
+import tempfile
+
+
+_umask_lock = Lock()
+
+
+def _file_mode(path: pathlib.Path) -> int:
+    """Returns the mode of an existing file, or the mode that `open` would give to a new file"""
+
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        pass
+
+    # The umask can only be read by setting it
+    with _umask_lock:
+        umask = os.umask(0)
+        os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+class FileSink:
+    """Destination of a download to a file path.
+
+    The content is written to a temporary file in the same directory, preallocated with the expected size,
+    which replaces the target file only when the download is complete. The target file keeps its mode, or gets the
+    mode of a file created with `open`, if it does not exist.
+
+    If `identity` is specified, the sink is resumable: the temporary file has a fixed name and the written byte ranges are
+    recorded in a checkpoint file next to it, so that an interrupted download can be continued later.
+
+    Parameters
+    ----------
+    path : `pathlib.Path`
+        Path of the target file.
+    size : `int`
+        Expected size of the content.
+    identity : `dict`, optional
+        JSON serializable identification of the remote content. A previous checkpoint is only used if it was saved with the
+        same identity. (Default: None)
+    """
+
+    __CHECKPOINT_INTERVAL = 16 << 20
+
+    def __init__(self, path: pathlib.Path, size: int, identity: Optional[Dict[str, Any]] = None):
+        self.__path = path
+        self.__size = size
+        self.__identity = identity
+        self.__lock = Lock()
+        self.__closed = False
+        self.__completed: List[List[int]] = []
+        self.__unsaved = 0
+
+        if identity is None:
+            fd, self.__tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".part", dir=path.parent)
+            self.__checkpoint = None
+        else:
+            self.__tmp = str(path.with_name(f".{path.name}.part"))
+            self.__checkpoint = self.__tmp+".json"
+            fd = self.__open_checkpoint()
+
+        self.__fd = fd
+
+        if size and not self.__completed:
+            try:
+                os.posix_fallocate(fd, 0, size)  # type: ignore
+            except (AttributeError, OSError):
+                os.ftruncate(fd, size)
+
+    def __repr__(self) -> str:
+        return f"FileSink({self.__path})"
+
+    def __open_checkpoint(self) -> int:
+        try:
+            with open(self.__checkpoint) as f:
+                checkpoint = json.load(f)
+
+            if checkpoint["identity"] == self.__identity and os.path.getsize(self.__tmp) == self.__size:
+                fd = os.open(self.__tmp, os.O_RDWR | getattr(os, "O_BINARY", 0))
+                self.__completed = [[start, end] for start, end in checkpoint["completed"]]
+                return fd
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        self.__remove_checkpoint()
+        return os.open(self.__tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+
+    def __remove_checkpoint(self):
+        if self.__checkpoint is not None:
+            try:
+                os.remove(self.__checkpoint)
+            except OSError:
+                pass
+
+    def __save_checkpoint(self):
+        # The data must reach the disk before the checkpoint claims it was written
+        os.fsync(self.__fd)
+
+        tmp = self.__checkpoint+".tmp"
+        with open(tmp, "w") as f:
+            json.dump(dict(identity=self.__identity, completed=self.__completed), f)
+
+        os.replace(tmp, self.__checkpoint)
+        self.__unsaved = 0
+
+    def __add_range(self, start: int, end: int):
+        ranges = self.__completed
+        i = bisect.bisect_left(ranges, [start, end])
+
+        if i > 0 and ranges[i-1][1] >= start:
+            i -= 1
+            start = ranges[i][0]
+
+        j = i
+        while j < len(ranges) and ranges[j][0] <= end:
+            end = max(end, ranges[j][1])
+            j += 1
+
+        ranges[i:j] = [[start, end]]
+
+    @property
+    def completed_size(self) -> int:
+        """Number of bytes of the content already written"""
+
+        with self.__lock:
+            return sum(end-start for start, end in self.__completed)
+
+    @property
+    def path(self) -> pathlib.Path:
+        """Path of the target file"""
+
+        return self.__path
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the written byte ranges are saved in a checkpoint"""
+
+        return self.__checkpoint is not None
+
+    def completed_ranges(self) -> List[Tuple[int, int]]:
+        """Returns the (offset, size) pairs of the content already written"""
+
+        with self.__lock:
+            return [(start, end-start) for start, end in self.__completed]
+
+    def missing_ranges(self) -> List[Tuple[int, int]]:
+        """Returns the (offset, size) pairs of the content not yet written"""
+
+        missing = []
+        offset = 0
+
+        with self.__lock:
+            for start, end in self.__completed:
+                if start > offset:
+                    missing.append((offset, start-offset))
+                offset = max(offset, end)
+
+        if offset < self.__size:
+            missing.append((offset, self.__size-offset))
+
+        return missing
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """Reads written content at an offset of the file"""
+
+        if hasattr(os, "pread"):
+            return os.pread(self.__fd, size, offset)
+
+        with self.__lock:
+            os.lseek(self.__fd, offset, os.SEEK_SET)
+            return os.read(self.__fd, size)
+
+    def reset(self):
+        """Discards the written byte ranges, when the content has to be written from the beginning"""
+
+        with self.__lock:
+            self.__completed.clear()
+            self.__unsaved = 0
+            self.__remove_checkpoint()
+
+    def write_at(self, offset: int, data: Union[bytes, memoryview]):
+        """Writes content at an offset of the file. It can be called from several threads at the same time."""
+
+        view = memoryview(data)
+        start, end = offset, offset+len(view)
+
+        if hasattr(os, "pwrite"):
+            while view:
+                n = os.pwrite(self.__fd, view, offset)
+                view, offset = view[n:], offset+n
+
+            with self.__lock:
+                self.__written(start, end)
+
+        else:
+            with self.__lock:
+                os.lseek(self.__fd, offset, os.SEEK_SET)
+                while view:
+                    view = view[os.write(self.__fd, view):]
+
+                self.__written(start, end)
+
+    def __written(self, start: int, end: int):
+        self.__add_range(start, end)
+
+        if self.__checkpoint is not None:
+            self.__unsaved += end-start
+
+            if self.__unsaved >= self.__CHECKPOINT_INTERVAL:
+                self.__save_checkpoint()
+
+    def commit(self):
+        """Flushes the content to disk and replaces the target file with it.
+
+        Raises
+        ------
+        ConnectionError
+            Raised if part of the content has not been written. The sink is kept open, so `abort` must still be called.
+        """
+
+        if self.__closed:
+            return
+
+        written = self.completed_size
+        if written != self.__size or self.missing_ranges():
+            raise ConnectionError(f"Download of {self.__path.name} is incomplete: {written} of {self.__size} bytes written")
+
+        self.__closed = True
+
+        try:
+            if os.fstat(self.__fd).st_size != self.__size:
+                os.ftruncate(self.__fd, self.__size)
+
+            os.fsync(self.__fd)
+        finally:
+            os.close(self.__fd)
+
+        os.chmod(self.__tmp, _file_mode(self.__path))
+        os.replace(self.__tmp, self.__path)
+        self.__remove_checkpoint()
+
+    def abort(self):
+        """Discards the content written, keeping the target file untouched.
+        If the sink is resumable, the content is kept for a later download instead."""
+
+        if self.__closed:
+            return
+
+        self.__closed = True
+
+        if self.__checkpoint is not None:
+            try:
+                with self.__lock:
+                    self.__save_checkpoint()
+            except OSError:
+                self.__remove_checkpoint()
+            else:
+                os.close(self.__fd)
+                return
+
+        os.close(self.__fd)
+
+        try:
+            os.remove(self.__tmp)
+        except OSError:
+            pass
+
+
+__all__ = ["FileSink"]
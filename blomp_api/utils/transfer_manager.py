@@ -0,0 +1,221 @@
+from ..exceptions import TransferCancelledError
+from .monitor import Monitor
+from .rate_limiter import BandwidthLimiter
+
+from concurrent.futures import Future
+from itertools import count
+from queue import PriorityQueue
+from threading import Lock, Thread
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import math
+
+
+class TransferFuture(Future):
+    """Handle of a transfer submitted to a `TransferManager`.
+
+    Parameters
+    ----------
+    monitor : Monitor, optional
+        Monitor of the transfer, used to stop it if it is cancelled while running. (Default: None)
+    """
+
+    def __init__(self, monitor: Optional[Monitor] = None):
+        super().__init__()
+        self.__monitor = monitor
+
+    @property
+    def monitor(self) -> Optional[Monitor]:
+        """Monitor of the transfer, if any"""
+
+        return self.__monitor
+
+    def cancel(self) -> bool:
+        """Cancels the transfer.
+
+        If the transfer has not started yet, it will never run. If it is running, it stops before the next block of content
+        is transferred, and `result` raises `TransferCancelledError`.
+
+        Returns
+        -------
+        cancelled : `bool`
+            False, if the transfer has already finished, or True otherwise.
+        """
+
+        if super().cancel():
+            if self.__monitor is not None:
+                self.__monitor.cancel()
+                self.__monitor._finish(TransferCancelledError("Transfer cancelled"))
+
+            return True
+
+        if self.done() or self.__monitor is None:
+            return False
+
+        self.__monitor.cancel()
+
+        return True
+
+
+class TransferManager:
+    """Pool of worker threads that run transfers submitted by `File.download` and `Folder.upload`, limiting how many run at the same time.
+
+    Parameters
+    ----------
+    max_workers : `int`, optional
+        Maximum number of transfers running at the same time. (Default: 4)
+    bandwidth_limiter : BandwidthLimiter, optional
+        If specified, the transfers run by this manager share the rate limits of this limiter,
+        in addition to those of the session. (Default: None)
+
+    Examples
+    --------
+    >>> with TransferManager(8) as manager:
+    ...     futures = [file.download("/path/to/save", manager=manager)[0] for file in folder.files]
+    ...     for future in futures:
+    ...         future.result()
+    """
+
+    def __init__(self, max_workers: int = 4, bandwidth_limiter: Optional[BandwidthLimiter] = None):
+        if max_workers <= 0:
+            raise ValueError("Maximum number of workers must be greater than zero")
+
+        self.__bandwidth_limiter = bandwidth_limiter
+
+        self.__queue: "PriorityQueue[tuple]" = PriorityQueue()
+        self.__counter = count()
+        self.__lock = Lock()
+        self.__shutdown = False
+        self.__workers: List[Thread] = []
+
+        for _ in range(max_workers):
+            worker = Thread(target=self.__worker, daemon=True)
+            worker.start()
+            self.__workers.append(worker)
+
+    def __enter__(self) -> "TransferManager":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"TransferManager(max_workers={self.max_workers}, pending={self.pending})"
+
+    def __worker(self):
+        while True:
+            _, _, future, fn, args, kwargs = self.__queue.get()
+
+            if future is None:
+                break
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    @property
+    def bandwidth_limiter(self) -> Optional[BandwidthLimiter]:
+        """Limiter of the rates of the transfers run by this manager, if any"""
+
+        return self.__bandwidth_limiter
+
+    @property
+    def max_workers(self) -> int:
+        """Maximum number of transfers running at the same time"""
+
+        return len(self.__workers)
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of transfers waiting to run"""
+
+        return self.__queue.qsize()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, priority: int = 0, monitor: Optional[Monitor] = None, **kwargs: Any) -> TransferFuture:
+        """Schedules a function to be run by the workers.
+
+        Parameters
+        ----------
+        fn : callable
+            Function to be run.
+        *args, **kwargs
+            Arguments of the function.
+        priority : `int`, optional
+            Functions with higher priority run first. Functions with the same priority run in submission order. (Default: 0)
+        monitor : Monitor, optional
+            Monitor of the transfer done by the function, used to cancel it while running. (Default: None)
+
+        Returns
+        -------
+        future : TransferFuture
+            Handle of the submitted function.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if this manager has been shut down.
+        """
+
+        future = TransferFuture(monitor)
+
+        with self.__lock:
+            if self.__shutdown:
+                raise RuntimeError("Cannot submit transfers after shutdown")
+
+            self.__queue.put((-priority, next(self.__counter), future, fn, args, kwargs))
+
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """Stops accepting new transfers and stops the workers after the pending transfers are run.
+
+        Parameters
+        ----------
+        wait : `bool`, optional
+            If True, waits until all workers have stopped. (Default: True)
+        cancel_pending : `bool`, optional
+            If True, transfers that have not started yet are cancelled. (Default: False)
+        """
+
+        with self.__lock:
+            if not self.__shutdown:
+                self.__shutdown = True
+
+                if cancel_pending:
+                    while not self.__queue.empty():
+                        self.__queue.get_nowait()[2].cancel()
+
+                for _ in self.__workers:
+                    self.__queue.put((math.inf, next(self.__counter), None, None, None, None))
+
+        if wait:
+            for worker in self.__workers:
+                worker.join()
+
+
+def start_transfer(target: Callable[..., Any], args: Sequence[Any], monitor: Monitor, manager: Optional[TransferManager] = None,
+                   priority: int = 0) -> Union[Thread, TransferFuture]:
+    """Runs a transfer in a new thread, or submits it to a transfer manager, if one is given.
+
+    Returns
+    -------
+    handle : `threading.Thread` or TransferFuture
+        The started thread, or the future returned by the manager.
+    """
+
+    if manager is None:
+        thread = Thread(target=monitor._track, args=(target, *args))
+        thread.start()
+
+        return thread
+
+    return manager.submit(monitor._track, target, *args, priority=priority, monitor=monitor)
+
+
+__all__ = ["TransferFuture", "TransferManager", "start_transfer"]
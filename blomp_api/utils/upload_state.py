@@ -0,0 +1,95 @@
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Union
+from uuid import uuid4
+
+import hashlib
+import json
+import os
+import pathlib
+
+
+def default_state_directory() -> pathlib.Path:
+    """Returns the directory where the state of resumable uploads is saved by default"""
+
+    cache = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home()/".cache"
+    return pathlib.Path(cache)/"blomp_api"/"uploads"
+
+
+class UploadState:
+    """State of a resumable chunked upload, saved in a JSON file.
+
+    The state holds the `dzUuid` of the upload and the indices of the chunks acknowledged by the server,
+    so that an interrupted upload can be continued from the chunks still missing.
+
+    Parameters
+    ----------
+    directory : `str` or `pathlib.Path`
+        Directory where the state file is saved.
+    key : `dict`
+        JSON serializable identification of the upload (local file and destination).
+        A saved state is only used if it was saved with the same key.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], key: Dict[str, Any]):
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+        self.__directory = pathlib.Path(directory)
+        self.__file = self.__directory/f"{digest}.json"
+        self.__key = key
+        self.__lock = Lock()
+        self.__uuid = str(uuid4())
+        self.__acknowledged = set()
+
+        try:
+            with open(self.__file) as f:
+                state = json.load(f)
+
+            if state["key"] == key:
+                self.__uuid = state["uuid"]
+                self.__acknowledged = set(state["chunks"])
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def __repr__(self) -> str:
+        return f"UploadState(uuid={self.__uuid}, acknowledged={len(self.__acknowledged)})"
+
+    @property
+    def acknowledged(self) -> FrozenSet[int]:
+        """Indices of the chunks already received by the server"""
+
+        with self.__lock:
+            return frozenset(self.__acknowledged)
+
+    @property
+    def uuid(self) -> str:
+        """`dzUuid` of the upload"""
+
+        return self.__uuid
+
+    def acknowledge(self, index: int):
+        """Records that the chunk of index `index` was received by the server, and saves the state"""
+
+        with self.__lock:
+            self.__acknowledged.add(index)
+            self.__directory.mkdir(0o700, parents=True, exist_ok=True)
+
+            tmp = self.__file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(dict(key=self.__key, uuid=self.__uuid, chunks=sorted(self.__acknowledged)), f)
+
+            os.replace(tmp, self.__file)
+
+    def discard(self):
+        """Removes the saved state, when the upload is complete or must be started again"""
+
+        with self.__lock:
+            self.__acknowledged.clear()
+
+            try:
+                os.remove(self.__file)
+            except OSError:
+                pass
+
+
+__all__ = ["UploadState", "default_state_directory"]
@@ -35,6 +35,7 @@ setup(
         "Blomp",
         "REST"],
     install_requires=requirements,
+    extras_require={"async": ["aiohttp"]},
     long_description=long_description,
     long_description_content_type="text/markdown",
     python_requires=">=3.8",